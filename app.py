@@ -33,7 +33,7 @@ from config import (
 )
 from auth import TokenManager
 from stockbit_client import StockbitClient
-from storage import CSVStorage
+from storage import create_storage
 from jobs import JobManager
 from orderbook_manager import OrderbookManager
 from orderbook_daemon import OrderbookDaemon
@@ -215,8 +215,8 @@ def get_market_status():
 # Initialize components
 token_manager = TokenManager()
 stockbit_client = StockbitClient(token_manager)
-csv_storage = CSVStorage()
-job_manager = JobManager(stockbit_client, csv_storage)
+storage = create_storage()
+job_manager = JobManager(stockbit_client, storage)
 orderbook_manager = OrderbookManager(token_manager)
 orderbook_daemon = OrderbookDaemon(token_manager, ORDERBOOK_WATCHLIST_FILE)
 
@@ -897,6 +897,31 @@ def api_replay_seek():
     else:
         return jsonify(result), 400
 
+@app.route('/api/replay/seek_time', methods=['POST'])
+def api_replay_seek_time():
+    """Seek to a wall-clock time in the replay"""
+    if not replay_engine:
+        return jsonify({
+            'success': False,
+            'error': 'Replay engine not initialized'
+        }), 400
+    
+    data = request.get_json() or {}
+    timestamp = data.get('timestamp')
+    
+    if timestamp is None:
+        return jsonify({
+            'success': False,
+            'error': 'timestamp required'
+        }), 400
+    
+    result = replay_engine.seek_time(timestamp)
+    
+    if result.get('success'):
+        return jsonify(result)
+    else:
+        return jsonify(result), 400
+
 @app.route('/api/replay/speed', methods=['POST'])
 def api_replay_set_speed():
     """Set replay speed multiplier"""
@@ -953,7 +978,7 @@ def api_replay_status():
 @app.route('/api/replay/data', methods=['GET'])
 def api_replay_get_full_data():
     """Get ALL data rows for client-side replay"""
-    if not replay_engine or not replay_engine.data_rows:
+    if not replay_engine or not replay_engine.total_rows:
         return jsonify({
             'success': False,
             'error': 'No data loaded'
@@ -961,15 +986,7 @@ def api_replay_get_full_data():
     
     # Optimization: return list of lists instead of dicts for smaller payload
     # Format: [timestamp_ts, price, freq, lot_size, side (0=bid, 1=offer)]
-    rows = []
-    for row in replay_engine.data_rows:
-        rows.append([
-            row['timestamp'].timestamp() * 1000, # ms timestamp
-            row['price'],
-            row['freq'],
-            row['lot_size'],
-            0 if row['side'] == 'BID' else 1
-        ])
+    rows = replay_engine.get_compact_rows()
     
     return jsonify({
         'success': True,
@@ -981,7 +998,7 @@ def api_replay_get_full_data():
 @app.route('/api/replay/data/chunked', methods=['GET'])
 def api_replay_get_chunked_data():
     """Get data in chunks for large files"""
-    if not replay_engine or not replay_engine.data_rows:
+    if not replay_engine or not replay_engine.total_rows:
         return jsonify({
             'success': False,
             'error': 'No data loaded'
@@ -991,7 +1008,7 @@ def api_replay_get_chunked_data():
         chunk_size = int(request.args.get('chunk_size', 100000))
         offset = int(request.args.get('offset', 0))
         
-        total = len(replay_engine.data_rows)
+        total = replay_engine.total_rows
         end = min(offset + chunk_size, total)
         
         if offset >= total:
@@ -1004,18 +1021,8 @@ def api_replay_get_chunked_data():
                 'has_more': False
             })
         
-        chunk = replay_engine.data_rows[offset:end]
-        
         # Convert to compact format
-        rows = []
-        for row in chunk:
-            rows.append([
-                row['timestamp'].timestamp() * 1000,  # ms timestamp
-                row['price'],
-                row['freq'],
-                row['lot_size'],
-                0 if row['side'] == 'BID' else 1
-            ])
+        rows = replay_engine.get_compact_rows(offset, end)
         
         logger.info(f"Serving chunk: offset={offset}, size={len(rows)}, total={total}")
         
@@ -1144,14 +1151,14 @@ def api_logs():
 
 @app.route('/api/files', methods=['GET'])
 def api_files_list():
-    """List output CSV files"""
-    files = csv_storage.list_output_files()
+    """List output files"""
+    files = storage.list_output_files()
     return jsonify({'files': files})
 
 @app.route('/api/files/download/<filename>', methods=['GET'])
 def api_file_download(filename):
-    """Download a CSV file"""
-    filepath = csv_storage.get_file_path(filename)
+    """Download an output file"""
+    filepath = storage.get_file_path(filename)
     
     if not filepath.exists():
         return jsonify({'error': 'File not found'}), 404
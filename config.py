@@ -70,7 +70,16 @@ LOGIN_HEADERS = {
 DEFAULT_DELAY_SECONDS = 3
 DEFAULT_LIMIT = 50
 DEFAULT_RETRY_COUNT = 3
-DEFAULT_RETRY_BACKOFF = 2  # seconds
+DEFAULT_RETRY_BACKOFF = 2  # growth factor per attempt
+RETRY_BACKOFF_BASE = 1.0  # seconds, first retry delay
+RETRY_BACKOFF_MAX = 30.0  # seconds, cap on a single retry delay
+RETRY_BACKOFF_JITTER = 0.5  # up to +50% random spread so workers don't retry in lockstep
+
+# Page request rate limit: a global cap shared by every fetch (all job
+# workers, fetch_many/fetch_bulk tasks) on one StockbitClient. The default
+# keeps the old per-worker pace of ~2 pages/s for a full 10-worker job.
+REQUEST_RATE_PER_SEC = float(os.environ.get('REQUEST_RATE_PER_SEC', '20'))
+REQUEST_BURST = 10  # lets every worker of a 10-worker job start at once
 
 # Token settings
 TOKEN_WARNING_THRESHOLD = 600  # seconds (10 minutes)
@@ -88,6 +97,12 @@ CSV_COLUMNS = [
     'lot', 'buyer', 'seller', 'trade_number', 'buyer_type',
     'seller_type', 'market_board'
 ]
+# job output format: 'csv' or 'parquet' (needs pyarrow)
+OUTPUT_FORMAT = os.environ.get('OUTPUT_FORMAT', 'csv').lower()
+
+# Market replay: pin the replay thread to this CPU and raise its priority
+# (Linux only; empty = no pinning)
+REPLAY_CPU = os.environ.get('REPLAY_CPU', '')
 
 # Credentials file (encrypted would be better but this works for class project)
 CREDENTIALS_FILE = CONFIG_DIR / 'credentials.json'
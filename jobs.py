@@ -4,9 +4,10 @@ Job scheduler and manager for fetching trade data
 import threading
 import time
 import uuid
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
+from collections import Counter
 from dataclasses import dataclass, asdict, field
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
@@ -57,6 +58,35 @@ class Job:
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
     tasks: List[Task] = field(default_factory=list)
+    # first 8 chars of job_id, the id shown to and typed by users
+    short_id: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.short_id = self.job_id[:8]
+        # aggregate counters kept in step with set_task_status/set_task_records
+        # so progress is O(1); plain attributes, so asdict() leaves them out
+        self._status_counts = Counter(t.status for t in self.tasks)
+        self._total_records = sum(t.records_fetched for t in self.tasks)
+        self._counts_lock = threading.Lock()
+    
+    def set_task_status(self, task: Task, status: TaskStatus):
+        """Change a task's status and update the job's status counts"""
+        with self._counts_lock:
+            self._status_counts[task.status] -= 1
+            self._status_counts[status] += 1
+            task.status = status
+    
+    def set_task_records(self, task: Task, records: int):
+        """Set a task's fetched-record count and update the job total"""
+        with self._counts_lock:
+            self._total_records += records - task.records_fetched
+            task.records_fetched = records
+    
+    def quick_progress(self) -> Tuple[int, int, int]:
+        """Return (done, total, records) from the cached counters"""
+        counts = self._status_counts
+        done = counts[TaskStatus.COMPLETED] + counts[TaskStatus.SKIPPED]
+        return done, len(self.tasks), self._total_records
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dict for JSON serialization"""
@@ -69,10 +99,9 @@ class Job:
     
     def get_progress(self) -> Dict[str, Any]:
         """Calculate job progress"""
-        total = len(self.tasks)
-        completed = sum(1 for t in self.tasks if t.status in [TaskStatus.COMPLETED, TaskStatus.SKIPPED])
-        failed = sum(1 for t in self.tasks if t.status == TaskStatus.FAILED)
-        running = sum(1 for t in self.tasks if t.status == TaskStatus.RUNNING)
+        completed, total, _ = self.quick_progress()
+        failed = self._status_counts[TaskStatus.FAILED]
+        running = self._status_counts[TaskStatus.RUNNING]
         
         return {
             'total': total,
@@ -86,10 +115,12 @@ class Job:
 class JobManager:
     """Manages job queue and execution"""
     
-    def __init__(self, stockbit_client, csv_storage):
+    def __init__(self, stockbit_client, storage):
         self.client = stockbit_client
-        self.storage = csv_storage
+        self.storage = storage
         self.jobs: Dict[str, Job] = {}
+        # first 8 chars of the job id -> full ids, for short-id lookups
+        self._prefix_index: Dict[str, List[str]] = {}
         self.current_job_id: Optional[str] = None
         self.worker_thread: Optional[threading.Thread] = None
         self.stop_flag = threading.Event()
@@ -156,7 +187,7 @@ class JobManager:
                         created_at=job_data['created_at'],
                         tasks=tasks
                     )
-                    self.jobs[job.job_id] = job
+                    self._register_job(job)
                     loaded_count += 1
             
             logger.info(f"Loaded {loaded_count} pending jobs from database")
@@ -181,7 +212,7 @@ class JobManager:
                 'total_tasks': progress['total'],
                 'completed_tasks': progress['completed'],
                 'failed_tasks': progress['failed'],
-                'total_records': sum(t.records_fetched for t in job.tasks)
+                'total_records': job.quick_progress()[2]
             }
             self.db.save_job(job_data)
         except Exception as e:
@@ -228,7 +259,7 @@ class JobManager:
             tasks=tasks
         )
         
-        self.jobs[job_id] = job
+        self._register_job(job)
         
         # persist to database
         self._persist_job(job)
@@ -245,6 +276,24 @@ class JobManager:
         """Get job by ID"""
         return self.jobs.get(job_id)
     
+    def _register_job(self, job: Job):
+        """Add a job to the registry and the short-id index"""
+        self.jobs[job.job_id] = job
+        self._prefix_index.setdefault(job.short_id.lower(), []).append(job.job_id)
+    
+    def find_job(self, partial_id: str) -> Optional[Job]:
+        """Get a job by a prefix of its ID (e.g. the 8-char short id)"""
+        partial_id = partial_id.lower()
+        if len(partial_id) >= 8:
+            candidates = self._prefix_index.get(partial_id[:8], [])
+        else:
+            # too short for the index, fall back to a scan
+            candidates = self.jobs.keys()
+        for jid in candidates:
+            if jid.lower().startswith(partial_id):
+                return self.jobs[jid]
+        return None
+    
     def list_jobs(self) -> List[Dict[str, Any]]:
         """List all jobs"""
         return [job.to_dict() for job in self.jobs.values()]
@@ -412,7 +461,7 @@ class JobManager:
                 'total_tasks': progress['total'],
                 'completed_tasks': progress['completed'],
                 'failed_tasks': progress['failed'],
-                'total_records': sum(t.records_fetched for t in job.tasks),
+                'total_records': job.quick_progress()[2],
                 'started_at': job.started_at,
                 'completed_at': job.completed_at,
             })
@@ -433,7 +482,7 @@ class JobManager:
     
     def _process_task(self, job: Job, task: Task):
         """Process a single task (fetch data for one ticker-date)"""
-        task.status = TaskStatus.RUNNING
+        job.set_task_status(task, TaskStatus.RUNNING)
         task.attempts += 1
         task.current_page = 0
         
@@ -442,60 +491,51 @@ class JobManager:
         # progress callback to update task in real-time
         def update_progress(page: int, total_records: int):
             task.current_page = page
-            task.records_fetched = total_records
+            job.set_task_records(task, total_records)
         
         try:
-            # fetch data with progress tracking
-            result = self.client.fetch_running_trade(
-                ticker=task.ticker,
-                date=task.date,
-                limit=job.limit,
-                progress_callback=update_progress
+            filename = self.storage.get_filename(
+                task.ticker,
+                job.from_date,
+                job.until_date
             )
             
-            if result.get('success'):
-                # save to CSV
-                trades = result.get('data', [])
-                filename = self.storage.get_filename(
-                    task.ticker,
-                    job.from_date,
-                    job.until_date
-                )
-                
-                save_result = self.storage.save_trades(
+            # fetch data with progress tracking, streaming each page to CSV
+            with self.storage.open_session(task.ticker, task.date, filename=filename) as writer:
+                result = self.client.fetch_running_trade(
                     ticker=task.ticker,
                     date=task.date,
-                    trades=trades,
-                    filename=filename
+                    limit=job.limit,
+                    progress_callback=update_progress,
+                    page_callback=writer.write
                 )
-                
-                if save_result.get('success'):
-                    task.status = TaskStatus.COMPLETED
-                    task.records_fetched = result.get('count', 0)
-                    task.pages_fetched = result.get('pages_fetched', 1)
-                    logger.info(f"Saved {task.records_fetched} records ({task.pages_fetched} pages) for {task.ticker} {task.date}")
-                    # persist progress every 5 tasks
-                    progress = job.get_progress()
-                    if progress['completed'] % 5 == 0:
-                        self._persist_job(job)
+                # only a complete fetch reaches the output file
+                if result.get('success'):
+                    writer.commit()
+            
+            if result.get('success'):
+                job.set_task_status(task, TaskStatus.COMPLETED)
+                job.set_task_records(task, result.get('count', 0))
+                task.pages_fetched = result.get('pages_fetched', 1)
+                logger.info(f"Saved {task.records_fetched} records ({task.pages_fetched} pages) for {task.ticker} {task.date}")
+                # persist progress every 5 tasks
+                progress = job.get_progress()
+                if progress['completed'] % 5 == 0:
+                    self._persist_job(job)
 
-                    # send milestone notifications at 25/50/75%
-                    pct = progress['percentage']
-                    for milestone in (25, 50, 75):
-                        if pct >= milestone and getattr(self, '_last_milestone', 0) < milestone:
-                            self._last_milestone = milestone
-                            self._notify('job_progress', {
-                                'job_id': job.job_id,
-                                'tickers': job.tickers,
-                                'percentage': pct,
-                                'completed': progress['completed'],
-                                'total': progress['total'],
-                                'failed': progress['failed'],
-                            })
-                else:
-                    task.status = TaskStatus.FAILED
-                    task.error = save_result.get('error', 'Unknown save error')
-                    logger.error(f"Failed to save {task.ticker} {task.date}: {task.error}")
+                # send milestone notifications at 25/50/75%
+                pct = progress['percentage']
+                for milestone in (25, 50, 75):
+                    if pct >= milestone and getattr(self, '_last_milestone', 0) < milestone:
+                        self._last_milestone = milestone
+                        self._notify('job_progress', {
+                            'job_id': job.job_id,
+                            'tickers': job.tickers,
+                            'percentage': pct,
+                            'completed': progress['completed'],
+                            'total': progress['total'],
+                            'failed': progress['failed'],
+                        })
             
             else:
                 # fetch failed
@@ -504,7 +544,7 @@ class JobManager:
                 # handle special cases - pause job gracefully
                 if result.get('requires_login'):
                     job.status = JobStatus.PAUSED
-                    task.status = TaskStatus.PENDING
+                    job.set_task_status(task, TaskStatus.PENDING)
                     task.error = 'Token expired - job paused'
                     task.current_page = 0
                     self._persist_job(job)
@@ -518,7 +558,7 @@ class JobManager:
                 
                 elif result.get('captcha_required'):
                     job.status = JobStatus.PAUSED
-                    task.status = TaskStatus.PENDING
+                    job.set_task_status(task, TaskStatus.PENDING)
                     task.error = 'Captcha required'
                     task.current_page = 0
                     self._persist_job(job)
@@ -532,12 +572,12 @@ class JobManager:
                 
                 else:
                     # other error - mark task failed and continue
-                    task.status = TaskStatus.FAILED
+                    job.set_task_status(task, TaskStatus.FAILED)
                     task.error = error
                     logger.error(f"Task failed {task.ticker} {task.date}: {error}")
         
         except Exception as e:
-            task.status = TaskStatus.FAILED
+            job.set_task_status(task, TaskStatus.FAILED)
             task.error = str(e)
             task.current_page = 0
             logger.error(f"Task exception {task.ticker} {task.date}: {e}")
@@ -7,6 +7,7 @@ import asyncio
 import threading
 import logging
 import json
+import sys
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
@@ -18,6 +19,12 @@ from orderbook_streamer import OrderbookStreamer
 logger = logging.getLogger(__name__)
 
 
+def _normalize_tickers(tickers: List[str]) -> List[str]:
+    """Strip/upper-case tickers and intern them, so the same few symbols
+    are shared objects across status snapshots and count dicts."""
+    return [sys.intern(t.strip().upper()) for t in tickers if t.strip()]
+
+
 class DaemonState(str, Enum):
     WAITING_MARKET = "waiting_market"
     STREAMING = "streaming"
@@ -73,7 +80,7 @@ class OrderbookDaemon:
             if self.watchlist_file.exists():
                 with open(self.watchlist_file, 'r') as f:
                     data = json.load(f)
-                    self.tickers = data.get('tickers', [])
+                    self.tickers = _normalize_tickers(data.get('tickers', []))
                     self.daily_stats = data.get('daily_stats', {})
                     logger.info(f"Loaded watchlist: {self.tickers}")
         except Exception as e:
@@ -422,7 +429,7 @@ class OrderbookDaemon:
     def set_tickers(self, tickers: List[str]) -> Dict:
         """Set the watchlist tickers"""
         old_tickers = self.tickers.copy()
-        self.tickers = [t.strip().upper() for t in tickers if t.strip()]
+        self.tickers = _normalize_tickers(tickers)
         self._save_watchlist()
 
         logger.info(f"Tickers updated: {old_tickers} → {self.tickers}")
@@ -448,7 +455,7 @@ class OrderbookDaemon:
 
     def add_tickers(self, tickers: List[str]) -> Dict:
         """Add tickers to the watchlist"""
-        new_tickers = [t.strip().upper() for t in tickers if t.strip()]
+        new_tickers = _normalize_tickers(tickers)
         added = []
         for t in new_tickers:
             if t not in self.tickers:
@@ -473,7 +480,7 @@ class OrderbookDaemon:
 
     def remove_tickers(self, tickers: List[str]) -> Dict:
         """Remove tickers from the watchlist"""
-        to_remove = [t.strip().upper() for t in tickers if t.strip()]
+        to_remove = _normalize_tickers(tickers)
         removed = []
         for t in to_remove:
             if t in self.tickers:
@@ -12,6 +12,22 @@ from perspective.handlers.tornado import PerspectiveTornadoHandler
 logger = logging.getLogger(__name__)
 
 
+def clear_table(table):
+    """Remove all rows from a Perspective table"""
+    if hasattr(table, 'clear'):
+        table.clear()
+        return
+    
+    # older perspective without Table.clear(): read every row back and remove them
+    view = table.view()
+    try:
+        records = view.to_records()
+        if records:
+            table.remove(records)
+    finally:
+        view.delete()
+
+
 class PerspectiveServer:
     """Manages the Perspective Tornado server in a background thread"""
     
@@ -52,8 +68,7 @@ class PerspectiveServer:
     def clear_table(self):
         """Clear all data from the table"""
         if self.table:
-            # Clear by removing all rows
-            self.table.remove(self.table.view().to_records())
+            clear_table(self.table)
             logger.info("Cleared Perspective table")
     
     def _make_app(self):
@@ -3,16 +3,104 @@ Market Replay Engine
 Reads orderbook CSV and replays with original timing, calculating changes
 """
 import csv
+import os
 import time
 import logging
 import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Tuple
-from collections import defaultdict
+from typing import Optional, Dict, List, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pa_csv
+
+from config import REPLAY_CPU
+from perspective_server import clear_table
 
 logger = logging.getLogger(__name__)
 
+# Column types for the orderbook CSV; timestamp is left to pyarrow's ISO-8601 inference
+CSV_CONVERT_OPTIONS = pa_csv.ConvertOptions(
+    column_types={
+        'price': pa.float64(),
+        'lots': pa.int64(),
+        'total_value': pa.float64(),
+        'side': pa.string(),
+    },
+    include_columns=['timestamp', 'price', 'lots', 'total_value', 'side'],
+)
+
+# Side codes: index 0 = BID, 1 = OFFER
+SIDE_BID = 0
+SIDE_OFFER = 1
+SIDE_LABELS = np.array(['BID', 'OFFER'])
+
+# One replay row, 32 bytes (two rows per cache line), fields ordered by hot-loop access.
+# key = index into ReplayEngine.unique_prices << 1 | side code
+REC_DTYPE = np.dtype([
+    ('ts', 'i8'),        # epoch nanoseconds
+    ('lot_size', 'i8'),
+    ('change', 'i8'),    # lot_size change vs. previous row with the same key
+    ('key', 'i4'),
+    ('freq', 'i4'),
+])
+assert REC_DTYPE.itemsize == 32
+
+try:
+    from numba import njit, types
+    from numba.typed import Dict as NumbaDict
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.info("numba not installed, replay seek uses the NumPy state rebuild")
+
+
+def _rebuild_state_np(keys: np.ndarray, position: int):
+    """
+    Row index of the last occurrence of each key over rows [0, position)
+    Keys are (price index << 1 | side) so bit 0 tells BID (0) from OFFER (1)
+    Returns (last_idx in ascending row order, last_bid_idx, last_offer_idx), -1 when a side is absent
+    """
+    # First occurrence in the reversed prefix == last occurrence in the prefix
+    _, first_rev = np.unique(keys[:position][::-1], return_index=True)
+    last_idx = np.sort(position - 1 - first_rev)
+    
+    is_offer = (keys[:position] & 1).astype(bool)
+    bid_rows = np.flatnonzero(~is_offer)
+    offer_rows = np.flatnonzero(is_offer)
+    last_bid_idx = int(bid_rows[-1]) if len(bid_rows) else -1
+    last_offer_idx = int(offer_rows[-1]) if len(offer_rows) else -1
+    
+    return last_idx, last_bid_idx, last_offer_idx
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _rebuild_state(keys, position):
+        """Single-pass compiled equivalent of _rebuild_state_np"""
+        last_row = NumbaDict.empty(key_type=types.int64, value_type=types.int64)
+        last_bid_idx = -1
+        last_offer_idx = -1
+        for i in range(position):
+            key = keys[i]
+            last_row[key] = i
+            if key & 1:
+                last_offer_idx = i
+            else:
+                last_bid_idx = i
+        
+        last_idx = np.empty(len(last_row), dtype=np.int64)
+        j = 0
+        for i in last_row.values():
+            last_idx[j] = i
+            j += 1
+        last_idx.sort()
+        return last_idx, last_bid_idx, last_offer_idx
+else:
+    _rebuild_state = _rebuild_state_np
+
 
 class ReplayEngine:
     """
@@ -26,18 +114,27 @@ class ReplayEngine:
         self.paused = False
         
         # Replay state
+        # One REC_DTYPE record per CSV row; prices live in unique_prices, indexed via the key
         self.csv_path = None
-        self.data_rows = []
+        self.rows = np.empty(0, dtype=REC_DTYPE)
+        self.unique_prices = np.empty(0, dtype='f8')
+        self._tz = None
+        
+        # Number of distinct (price, side) keys seen up to and including each row
+        self.state_size_upto = np.empty(0, dtype='i8')
+        
+        # Start index of each run of rows sharing one timestamp
+        self.run_start = np.empty(0, dtype='i8')
         self.current_index = 0
         self.speed_multiplier = 1.0
         
-        # State tracking for change calculation
+        # Orderbook state as of current_index, only materialized on demand (see `state`)
         # Key: (price, side) -> Value: lots
-        self.state: Dict[Tuple[float, str], int] = {}
+        self._state: Dict[Tuple[float, str], int] = {}
+        self._state_index = 0
         
-        # Timestamp tracking (last update time per side)
-        self.last_bid_timestamp = None
-        self.last_offer_timestamp = None
+        # Timestamp tracking: last update time per side as epoch ns, indexed by side code (0 = none)
+        self.last_ts = np.zeros(2, dtype='i8')
         self.current_timestamp = None
         
         # Stats
@@ -50,6 +147,13 @@ class ReplayEngine:
         self._pause_event = threading.Event()
         self._pause_event.set()  # not paused by default
         
+        # Compile (or load from cache) the state rebuild up front so the first seek is fast
+        if NUMBA_AVAILABLE:
+            # a field view of 2+ records is strided like self.rows['key'],
+            # so numba compiles the same array layout the seeks will use
+            warmup = np.zeros(2, dtype=REC_DTYPE)
+            _rebuild_state(warmup['key'], 1)
+        
         logger.info("ReplayEngine initialized")
     
     def load_csv(self, csv_path: str) -> Dict:
@@ -66,40 +170,65 @@ class ReplayEngine:
                 }
             
             self.csv_path = csv_path
-            self.data_rows = []
             
-            # Read entire CSV into memory
+            # The first row carries the timezone (if any) used to display timestamps
             with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # Parse timestamp
-                    timestamp_str = row['timestamp']
-                    timestamp = datetime.fromisoformat(timestamp_str)
-                    
-                    self.data_rows.append({
-                        'timestamp': timestamp,
-                        'price': float(row['price']),
-                        'freq': int(row['lots']),  # lots column = frequency
-                        'lot_size': int(float(row['total_value']) / 100),  # total_value / 100 = lot_size
-                        'side': row['side']
-                    })
+                first_row = next(csv.DictReader(f), None)
+            first_timestamp = datetime.fromisoformat(first_row['timestamp']) if first_row else None
+            self._tz = first_timestamp.tzinfo if first_timestamp else None
             
-            self.total_rows = len(self.data_rows)
+            # Parse straight from the mapped file pages into Arrow columns
+            with pa.memory_map(str(csv_path), 'r') as source:
+                table = pa_csv.read_csv(source, convert_options=CSV_CONVERT_OPTIONS)
+            
+            timestamp_col = table.column('timestamp')
+            if not pa.types.is_timestamp(timestamp_col.type):
+                timestamp_col = pc.cast(timestamp_col, pa.timestamp('ns'))
+            ts_ns = timestamp_col.cast(pa.timestamp('ns', tz=timestamp_col.type.tz)).cast(pa.int64()).to_numpy()
+            if timestamp_col.type.tz is None and first_timestamp:
+                # Naive timestamps are local wall-clock time; shift to epoch like datetime.timestamp()
+                local_offset = first_timestamp.astimezone().utcoffset()
+                ts_ns = ts_ns - int(local_offset.total_seconds() * 1e9)
+            
+            # total_value / 100 = lot_size, computed in Arrow without materializing total_value in NumPy
+            lot_size = pc.divide(table.column('total_value'), 100).cast(pa.int64(), safe=False).to_numpy()
+            side_code = pc.not_equal(table.column('side'), 'BID').to_numpy(zero_copy_only=False)
+            self.unique_prices, price_idx = np.unique(table.column('price').to_numpy(), return_inverse=True)
+            key = (price_idx.astype('i8') << 1) | side_code
+            change, self.state_size_upto = self._precompute_changes(key, lot_size)
+            
+            rows = np.empty(len(ts_ns), dtype=REC_DTYPE)
+            rows['ts'] = ts_ns
+            rows['lot_size'] = lot_size
+            rows['change'] = change
+            rows['key'] = key
+            rows['freq'] = table.column('lots').to_numpy()  # lots column = frequency
+            self.rows = rows
+            del table
+            
+            self._state = {}
+            self._state_index = 0
+            
+            # Rows with identical timestamps (one orderbook snapshot) are replayed as one block
+            self.run_start = np.flatnonzero(np.r_[True, np.diff(ts_ns) != 0])
+            
+            self.total_rows = len(rows)
             self.current_index = 0
             
             # Extract metadata
             ticker = csv_path.stem.split('_')[-1] if '_' in csv_path.stem else 'UNKNOWN'
-            date = self.data_rows[0]['timestamp'].date() if self.data_rows else None
+            start_time = self._timestamp(ts_ns[0]) if self.total_rows else None
+            end_time = self._timestamp(ts_ns[-1]) if self.total_rows else None
             
-            logger.info(f"Loaded {self.total_rows} rows from {csv_path.name}")
+            logger.info(f"Loaded {self.total_rows} rows ({len(self.run_start)} snapshots) from {csv_path.name}")
             
             return {
                 'success': True,
                 'total_rows': self.total_rows,
                 'ticker': ticker,
-                'date': str(date),
-                'start_time': self.data_rows[0]['timestamp'].isoformat() if self.data_rows else None,
-                'end_time': self.data_rows[-1]['timestamp'].isoformat() if self.data_rows else None
+                'date': str(start_time.date() if start_time else None),
+                'start_time': start_time.isoformat() if start_time else None,
+                'end_time': end_time.isoformat() if end_time else None
             }
             
         except Exception as e:
@@ -109,19 +238,117 @@ class ReplayEngine:
                 'error': str(e)
             }
     
-    def _calculate_change(self, price: float, side: str, lot_size: int) -> int:
+    def _timestamp(self, ns: int) -> datetime:
+        """Convert epoch nanoseconds back to a datetime in the CSV's timezone"""
+        return datetime.fromtimestamp(int(ns) / 1e9, self._tz)
+    
+    @property
+    def last_bid_timestamp(self) -> Optional[datetime]:
+        """Timestamp of the last replayed BID row"""
+        return self._timestamp(self.last_ts[SIDE_BID]) if self.last_ts[SIDE_BID] else None
+    
+    @property
+    def last_offer_timestamp(self) -> Optional[datetime]:
+        """Timestamp of the last replayed OFFER row"""
+        return self._timestamp(self.last_ts[SIDE_OFFER]) if self.last_ts[SIDE_OFFER] else None
+    
+    def get_compact_rows(self, start: int = 0, end: Optional[int] = None) -> List[list]:
         """
-        Calculate change in lot_size from previous state
+        Rows in compact list form for client-side replay
+        Format: [timestamp_ms, price, freq, lot_size, side (0=bid, 1=offer)]
         """
-        key = (price, side)
+        block = self.rows[start:end]
+        return [
+            list(row) for row in zip(
+                (block['ts'] / 1e6).tolist(),
+                self.unique_prices[block['key'] >> 1].tolist(),
+                block['freq'].tolist(),
+                block['lot_size'].tolist(),
+                (block['key'] & 1).tolist()
+            )
+        ]
+    
+    @staticmethod
+    def _precompute_changes(keys: np.ndarray, lots: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate change in lot_size from the previous row with the same (price, side) key
+        for every row at once. Returns (change, distinct keys seen up to each row)
+        """
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        sorted_lots = lots[order]
         
-        old_lots = self.state.get(key, 0)
-        change = lot_size - old_lots
+        # Rows are grouped by key in original order, so the previous row in a group is the previous state
+        first_in_group = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+        previous = np.r_[0, sorted_lots[:-1]]
+        previous[first_in_group] = 0
         
-        # Update state
-        self.state[key] = lot_size
+        change = np.empty_like(lots)
+        change[order] = sorted_lots - previous
         
-        return change
+        first_seen = np.zeros(len(keys), dtype=bool)
+        first_seen[order[first_in_group]] = True
+        return change, np.cumsum(first_seen)
+    
+    def _build_state(self, position: int) -> Tuple[Dict[Tuple[float, str], int], np.ndarray, int, int]:
+        """
+        Reconstruct the orderbook state after rows [0, position)
+        Returns (state, last row per level in row order, last_bid_idx, last_offer_idx)
+        """
+        last_idx, last_bid_idx, last_offer_idx = _rebuild_state(self.rows['key'], position)
+        
+        levels = self.rows[last_idx]
+        sides = SIDE_LABELS[levels['key'] & 1].tolist()
+        prices = self.unique_prices[levels['key'] >> 1].tolist()
+        state = dict(zip(zip(prices, sides), levels['lot_size'].tolist()))
+        return state, levels, last_bid_idx, last_offer_idx
+    
+    def _push_snapshot(self, levels: np.ndarray):
+        """Replace the Perspective table with the given levels in one columnar call"""
+        keys = levels['key']
+        try:
+            self.table.replace({
+                'timestamp': [self._timestamp(ts) for ts in levels['ts'].tolist()],
+                'price': self.unique_prices[keys >> 1].tolist(),
+                'side': SIDE_LABELS[keys & 1].tolist(),
+                'freq': levels['freq'].tolist(),
+                'lot_size': levels['lot_size'].tolist(),
+                'change': [0] * len(levels)
+            })
+        except Exception as e:
+            logger.warning(f"Failed to push seek snapshot to Perspective: {e}")
+    
+    @property
+    def state(self) -> Dict[Tuple[float, str], int]:
+        """Orderbook state (price, side) -> lots as of current_index, rebuilt lazily when stale"""
+        position = self.current_index
+        if self._state_index != position:
+            self._state, _, _, _ = self._build_state(position)
+            self._state_index = position
+        return self._state
+    
+    def _clear_table(self):
+        """Remove all rows from the Perspective table"""
+        try:
+            clear_table(self.table)
+        except Exception as e:
+            logger.warning(f"Failed to clear Perspective table: {e}")
+    
+    def _pin_thread(self):
+        """Pin the replay thread to REPLAY_CPU and raise its priority to reduce timing jitter"""
+        if not REPLAY_CPU:
+            return
+        try:
+            # pid 0 = calling thread on Linux
+            os.sched_setaffinity(0, {int(REPLAY_CPU)})
+            logger.info(f"Replay thread pinned to CPU {REPLAY_CPU}")
+        except (AttributeError, OSError, ValueError) as e:
+            logger.warning(f"Could not pin replay thread to CPU {REPLAY_CPU}: {e}")
+        try:
+            # raising priority needs root/CAP_SYS_NICE; pinning alone still helps
+            os.nice(-5)
+        except (AttributeError, OSError) as e:
+            logger.warning(f"Could not raise replay thread priority: {e}")
     
     def _replay_loop(self):
         """
@@ -131,82 +358,94 @@ class ReplayEngine:
         logger.info(f"Starting replay loop: {self.total_rows} rows, speed={self.speed_multiplier}x")
         
         self.running = True
+        self._pin_thread()
         self.start_time = time.time()
         self.elapsed_time = 0.0
         
-        # Clear state
-        self.state.clear()
-        self.last_bid_timestamp = None
-        self.last_offer_timestamp = None
-        self.current_timestamp = None
+        # Clear timestamps and table when starting from the top
+        # (a seek has already set them to the snapshot at its position otherwise)
+        if self.current_index == 0:
+            self.last_ts[:] = 0
+            self.current_timestamp = None
+            if self.table:
+                self._clear_table()
         
-        # Clear table before starting
-        if self.table:
-            try:
-                # Remove all existing data
-                view = self.table.view()
-                records = view.to_records()
-                if records:
-                    self.table.remove(records)
-            except:
-                pass
+        # Resolve the debug level once instead of per snapshot
+        log_debug = logger.isEnabledFor(logging.DEBUG)
+        last_log_index = self.current_index
         
         try:
+            # Locate the run containing the start position (may be mid-run after a seek)
+            run = int(np.searchsorted(self.run_start, self.current_index, side='right')) - 1
+            n_runs = len(self.run_start)
+            
+            # Snapshots are scheduled against one monotonic anchor rather than chained sleeps,
+            # so late wakeups don't accumulate into drift. Re-anchored on pause and speed change.
+            anchor_wall = None
+            anchor_ns = 0
+            speed = self.speed_multiplier
+            
             while self.current_index < self.total_rows and not self._stop_event.is_set():
                 # Wait if paused
-                self._pause_event.wait()
+                if not self._pause_event.is_set():
+                    self._pause_event.wait()
+                    anchor_wall = None
                 
                 # Check if stopped while paused
                 if self._stop_event.is_set():
                     break
                 
-                current_row = self.data_rows[self.current_index]
+                a = self.current_index
+                b = int(self.run_start[run + 1]) if run + 1 < n_runs else self.total_rows
                 
-                # Update timestamp tracking
-                self.current_timestamp = current_row['timestamp']
-                if current_row['side'] == 'BID':
-                    self.last_bid_timestamp = current_row['timestamp']
-                else:
-                    self.last_offer_timestamp = current_row['timestamp']
+                # Every row in the run shares one timestamp
+                block = self.rows[a:b]
+                ts = block['ts'][0]
                 
-                # Calculate change (Change logic: based on lot_size difference)
-                change = self._calculate_change(
-                    current_row['price'],
-                    current_row['side'],
-                    current_row['lot_size']
-                )
+                if anchor_wall is None or self.speed_multiplier != speed:
+                    speed = self.speed_multiplier
+                    anchor_wall = time.perf_counter()
+                    anchor_ns = ts
+                timestamp = self._timestamp(ts)
+                keys = block['key']
+                side_codes = keys & 1
+                sides = SIDE_LABELS[side_codes].tolist()
+                prices = self.unique_prices[keys >> 1].tolist()
+                lot_sizes = block['lot_size'].tolist()
                 
-                # Prepare update for Perspective
-                update_data = {
-                    'timestamp': current_row['timestamp'], # Add timestamp
-                    'price': current_row['price'],
-                    'side': current_row['side'],
-                    'freq': current_row['freq'],       # Add freq
-                    'lot_size': current_row['lot_size'], # Add lot_size
-                    'change': change
-                }
+                # Update timestamp tracking
+                self.current_timestamp = timestamp
+                self.last_ts[side_codes] = ts
                 
-                # Push to Perspective table (thread-safe)
+                # Push the whole snapshot to Perspective in one columnar update (thread-safe)
                 if self.table:
-                    self.table.update([update_data])
+                    self.table.update({
+                        'timestamp': [timestamp] * (b - a),
+                        'price': prices,
+                        'side': sides,
+                        'freq': block['freq'].tolist(),
+                        'lot_size': lot_sizes,
+                        'change': block['change'].tolist()
+                    })
                     
-                    # Log every 100th update for debugging
-                    if self.current_index % 100 == 0:
-                        logger.debug(f"Replay progress: {self.current_index}/{self.total_rows} - Last: {current_row['side']} @ {current_row['price']} x {current_row['lots']}")
+                    # Log roughly every 100 rows for debugging
+                    if log_debug and b - last_log_index >= 100:
+                        logger.debug("Replay progress: %d/%d - Last: %s @ %s x %s",
+                                     b, self.total_rows, sides[-1], prices[-1], lot_sizes[-1])
+                        last_log_index = b
                 
-                # Calculate sleep time if not the last row
-                if self.current_index < self.total_rows - 1:
-                    next_row = self.data_rows[self.current_index + 1]
-                    time_delta = (next_row['timestamp'] - current_row['timestamp']).total_seconds()
-                    
+                self.current_index = b
+                run += 1
+                
+                # Sleep until the next snapshot (not after the last one)
+                if b < self.total_rows:
                     # Apply speed multiplier (faster replay with higher multiplier)
-                    sleep_time = time_delta / self.speed_multiplier
+                    target = anchor_wall + (self.rows['ts'][b] - anchor_ns) / 1e9 / speed
+                    sleep_time = target - time.perf_counter()
                     
-                    # Sleep if positive (handle same-timestamp batches)
-                    if sleep_time > 0:
-                        time.sleep(sleep_time)
-                
-                self.current_index += 1
+                    # Wait on the stop event so stop/seek interrupts the sleep immediately
+                    if sleep_time > 0 and self._stop_event.wait(timeout=sleep_time):
+                        break
                 
                 # Update elapsed time
                 self.elapsed_time = time.time() - self.start_time
@@ -233,7 +472,7 @@ class ReplayEngine:
                 'error': 'Replay already running'
             }
         
-        if not self.data_rows:
+        if not self.total_rows:
             return {
                 'success': False,
                 'error': 'No data loaded. Call load_csv() first.'
@@ -244,14 +483,15 @@ class ReplayEngine:
         self._pause_event.set()  # ensure not paused
         
         # Start replay thread
+        start_index = self.current_index
         self.thread = threading.Thread(target=self._replay_loop, daemon=True)
         self.thread.start()
         
-        logger.info(f"Replay started at index {self.current_index}, speed {speed_multiplier}x")
+        logger.info(f"Replay started at index {start_index}, speed {speed_multiplier}x")
         
         return {
             'success': True,
-            'message': f'Replay started at row {self.current_index}',
+            'message': f'Replay started at row {start_index}',
             'speed_multiplier': speed_multiplier
         }
     
@@ -316,56 +556,21 @@ class ReplayEngine:
         # Stop if running
         if was_running:
             self.stop()
-            time.sleep(0.1)  # brief delay to ensure stop
-        
-        # Optimization: Forward seek
-        if position > self.current_index and self.state:
-            logger.info(f"Seeking forward from {self.current_index} to {position}...")
-            for i in range(self.current_index, position):
-                if i < len(self.data_rows):
-                    row = self.data_rows[i]
-                    key = (row['price'], row['side'])
-                    self.state[key] = row['lots']
-            self.current_index = position
-            
-            # Update timestamps from the last row processed
-            if position > 0:
-                last_row = self.data_rows[position - 1]
-                self.current_timestamp = last_row['timestamp']
-                # Note: We can't easily retrieve last_bid/offer_timestamp without full scan,
-                # but we can at least update current_timestamp which is most important.
-                # For exact precision on side-specific timestamps, full scan is needed,
-                # but for simple scrubbing, this tradeoff is acceptable for performance.
-                if last_row['side'] == 'BID':
-                    self.last_bid_timestamp = last_row['timestamp']
-                else:
-                    self.last_offer_timestamp = last_row['timestamp']
-
-        else:
-            # Backward seek or initial load: Full rebuild
-            logger.info(f"Rebuilding state up to position {position}...")
-            
-            # Reset state
-            self.state.clear()
-            self.current_index = position
-            self.last_bid_timestamp = None
-            self.last_offer_timestamp = None
-            self.current_timestamp = None
-            
-            # Rebuild state
-            for i in range(position):
-                row = self.data_rows[i]
-                key = (row['price'], row['side'])
-                self.state[key] = row['lots']
-                
-                # Update timestamps
-                if row['side'] == 'BID':
-                    self.last_bid_timestamp = row['timestamp']
-                else:
-                    self.last_offer_timestamp = row['timestamp']
-            
-            if position > 0:
-                self.current_timestamp = self.data_rows[position-1]['timestamp']
+        
+        logger.info(f"Rebuilding state up to position {position}...")
+        
+        self._state, levels, last_bid_idx, last_offer_idx = self._build_state(position)
+        self._state_index = position
+        
+        # Bring the table to the rebuilt state at once instead of waiting for updates to converge
+        if self.table:
+            self._push_snapshot(levels)
+        
+        self.current_index = position
+        ts_ns = self.rows['ts']
+        self.last_ts[SIDE_BID] = ts_ns[last_bid_idx] if last_bid_idx >= 0 else 0
+        self.last_ts[SIDE_OFFER] = ts_ns[last_offer_idx] if last_offer_idx >= 0 else 0
+        self.current_timestamp = self._timestamp(ts_ns[position - 1]) if position > 0 else None
         
         logger.info(f"Seeked to position {position}")
         
@@ -378,6 +583,29 @@ class ReplayEngine:
             'message': f'Seeked to row {position}'
         }
     
+    def seek_time(self, timestamp) -> Dict:
+        """
+        Seek to a wall-clock time (ISO-8601 string, datetime, or epoch nanoseconds)
+        Lands after the last row at or before that time
+        """
+        if not self.total_rows:
+            return {'success': False, 'error': 'No data loaded. Call load_csv() first.'}
+        
+        if isinstance(timestamp, int):
+            target_ns = timestamp
+        else:
+            try:
+                target = timestamp if isinstance(timestamp, datetime) else datetime.fromisoformat(str(timestamp))
+            except ValueError:
+                return {'success': False, 'error': f'Invalid timestamp: {timestamp}'}
+            if target.tzinfo is None and self._tz is not None:
+                target = target.replace(tzinfo=self._tz)
+            target_ns = int(round(target.timestamp() * 1_000_000)) * 1000
+        
+        # Binary search on the sorted timestamp column
+        position = int(np.searchsorted(self.rows['ts'], target_ns, side='right'))
+        return self.seek(min(position, self.total_rows - 1))
+    
     def set_speed(self, multiplier: float) -> Dict:
         """Change playback speed (applies immediately)"""
         if multiplier <= 0:
@@ -403,7 +631,7 @@ class ReplayEngine:
             'progress_percent': (self.current_index / self.total_rows * 100) if self.total_rows > 0 else 0,
             'speed_multiplier': self.speed_multiplier,
             'elapsed_time': self.elapsed_time,
-            'state_size': len(self.state),
+            'state_size': int(self.state_size_upto[self.current_index - 1]) if self.current_index > 0 else 0,
             'current_timestamp': self.current_timestamp.isoformat() if self.current_timestamp else None,
             'last_bid_timestamp': self.last_bid_timestamp.isoformat() if self.last_bid_timestamp else None,
             'last_offer_timestamp': self.last_offer_timestamp.isoformat() if self.last_offer_timestamp else None
@@ -72,14 +72,14 @@ def main():
 
     from auth import TokenManager
     from stockbit_client import StockbitClient
-    from storage import CSVStorage
+    from storage import create_storage
     from jobs import JobManager
     from orderbook_daemon import OrderbookDaemon
 
     token_manager = TokenManager()
     client = StockbitClient(token_manager)
-    csv_storage = CSVStorage()
-    job_manager = JobManager(client, csv_storage)
+    storage = create_storage()
+    job_manager = JobManager(client, storage)
     orderbook_daemon = OrderbookDaemon(token_manager, ORDERBOOK_WATCHLIST_FILE)
 
     # -- optional Google Drive uploader --
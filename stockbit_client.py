@@ -1,22 +1,240 @@
 """
 Stockbit API client for fetching running trade data
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Callable
+import asyncio
+import json
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
 import time
+import threading
 import logging
 from config import (
     STOCKBIT_RUNNING_TRADE_URL, HEADERS_TEMPLATE,
-    DEFAULT_LIMIT, DEFAULT_RETRY_COUNT, DEFAULT_RETRY_BACKOFF
+    DEFAULT_LIMIT, DEFAULT_RETRY_COUNT, DEFAULT_RETRY_BACKOFF,
+    RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX, RETRY_BACKOFF_JITTER,
+    REQUEST_RATE_PER_SEC, REQUEST_BURST
 )
 
 logger = logging.getLogger(__name__)
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# orjson parses the multi-hundred-KB trade pages straight from bytes
+try:
+    import orjson
+    _json_loads = orjson.loads
+    ORJSON_AVAILABLE = True
+except ImportError:
+    _json_loads = json.loads
+    ORJSON_AVAILABLE = False
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+def _backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Seconds to wait before the next retry
+    
+    Uses the server's Retry-After when given, otherwise capped exponential
+    backoff. Either way a random jitter is added on top.
+    """
+    delay = _parse_retry_after(retry_after)
+    if delay is None:
+        delay = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * DEFAULT_RETRY_BACKOFF ** attempt)
+    return delay * (1 + random.uniform(0, RETRY_BACKOFF_JITTER))
+
+# advertise br/zstd only when brotli/zstandard are installed to decode them
+ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
+
+# pages come back newest-first; once a page reaches the open we stop paging
+MARKET_OPEN_CUTOFF = 9 * 3600  # 09:00:00 as seconds since midnight
+
+def _hms_to_sec(s: str) -> int:
+    """Convert a fixed-width 'HH:MM:SS' string to seconds since midnight"""
+    return int(s[0:2]) * 3600 + int(s[3:5]) * 60 + int(s[6:8])
+
+def _reached_market_open(page_trades: List[Dict[str, Any]]) -> Optional[str]:
+    """Return the page's earliest trade time if it is at or before the open"""
+    trade_time = page_trades[-1].get('time', '')
+    if not trade_time:
+        return None
+    try:
+        seconds = _hms_to_sec(trade_time)
+    except ValueError:
+        logger.warning(f"Unexpected trade time format: {trade_time!r}")
+        return None
+    return trade_time if seconds <= MARKET_OPEN_CUTOFF else None
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared by sync threads and async tasks
+    
+    reserve() takes a token immediately (going into debt if the bucket is
+    empty) and returns how long the caller must wait, so callers queue up
+    at exactly rate_per_sec without holding the lock while sleeping.
+    """
+    
+    def __init__(self, rate_per_sec: float, burst: int = 1):
+        self.rate = rate_per_sec
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Take one token and return the seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+    
+    def acquire(self):
+        """Block until a token is available"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def acquire_async(self):
+        """Await until a token is available"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
 class StockbitClient:
     """Client for Stockbit Running Trade API"""
     
     def __init__(self, token_manager):
         self.token_manager = token_manager
+
+        # one pooled session so paginated requests reuse keep-alive connections
+        # instead of paying a fresh TCP + TLS handshake per page
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=16, pool_maxsize=64, max_retries=0
+        ))
+        self._session.headers.update(HEADERS_TEMPLATE)
+        self._session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        self._encoding_logged = False
+        
+        # paces page requests across all tickers fetched through this client
+        self._limiter = TokenBucket(REQUEST_RATE_PER_SEC, REQUEST_BURST)
+        
+        # last token that worked; dropped after a 401, or once the token
+        # manager holds a different token or the cached one has expired
+        self._cached_token: Optional[str] = None
+        self._last_token: Optional[str] = None
+        self._token_lock: Optional[asyncio.Lock] = None
+
+    def _cached_token_current(self) -> bool:
+        """Whether the cached token is still the manager's token and unexpired"""
+        token_manager = self.token_manager
+        # identity check: a token set via the UI or auto-login is a new object
+        if self._cached_token is None or token_manager.token is not self._cached_token:
+            return False
+        return not token_manager.exp or time.time() < token_manager.exp
+    
+    def _get_token(self) -> Optional[str]:
+        """Return the cached token, asking the token manager only on a miss"""
+        if self._cached_token_current():
+            return self._cached_token
+        token = self._cached_token = self.token_manager.get_valid_token()
+        return token
+    
+    async def _get_token_async(self) -> Optional[str]:
+        """_get_token for async tasks; one refresh at a time so tasks don't stampede"""
+        if self._cached_token_current():
+            return self._cached_token
+        if self._token_lock is None:
+            return self._get_token()
+        async with self._token_lock:
+            return self._get_token()
+    
+    def _handle_unauthorized(self, token: str):
+        """Drop the cached token and invalidate it if it's still the current one"""
+        self._cached_token = None
+        # a 401 on a stale cached token must not wipe a newer one set meanwhile
+        if self.token_manager.get_valid_token() == token:
+            self.token_manager.mark_token_invalid()
+    
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections"""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    @staticmethod
+    def _build_params(
+        ticker: str,
+        date: str,
+        limit: int,
+        trade_number: Optional[int]
+    ) -> Dict[str, Any]:
+        """Build the running trade query params for one page"""
+        params = {
+            'sort': 'DESC',
+            'limit': limit,
+            'order_by': 'RUNNING_TRADE_ORDER_BY_TIME',
+            'symbols[]': ticker,
+            'date': date
+        }
+        
+        # add trade_number for pagination if provided
+        if trade_number is not None:
+            params['trade_number'] = trade_number
+        
+        return params
+    
+    @staticmethod
+    def _parse_page(data: Dict[str, Any], ticker: str, date: str) -> Dict[str, Any]:
+        """Extract the running_trade list from a decoded response body"""
+        if 'data' in data and isinstance(data['data'], dict):
+            running_trade = data['data'].get('running_trade', [])
+            is_open_market = data['data'].get('is_open_market', False)
+        else:
+            # fallback if structure is different
+            running_trade = data.get('running_trade', [])
+            is_open_market = data.get('is_open_market', False)
+        
+        return {
+            'success': True,
+            'data': running_trade,
+            'is_open_market': is_open_market,
+            'count': len(running_trade),
+            'ticker': ticker,
+            'date': date
+        }
     
     def _fetch_page(
         self,
@@ -40,7 +258,7 @@ class StockbitClient:
             Dict with success status, data, and error info
         """
         # get valid token
-        token = self.token_manager.get_valid_token()
+        token = self._get_token()
         if not token:
             return {
                 'success': False,
@@ -48,36 +266,25 @@ class StockbitClient:
                 'requires_login': True
             }
         
-        # build query params
-        params = {
-            'sort': 'DESC',
-            'limit': limit,
-            'order_by': 'RUNNING_TRADE_ORDER_BY_TIME',
-            'symbols[]': ticker,
-            'date': date
-        }
+        params = self._build_params(ticker, date, limit, trade_number)
         
-        # add trade_number for pagination if provided
-        if trade_number is not None:
-            params['trade_number'] = trade_number
-        
-        # build headers with auth
-        headers = HEADERS_TEMPLATE.copy()
-        headers['Authorization'] = f'Bearer {token}'
+        # auth lives on the session too; only rewrite it when the token rotates
+        if token != self._last_token:
+            self._session.headers['Authorization'] = f'Bearer {token}'
+            self._last_token = token
         
         # attempt request with retries
         for attempt in range(retry_count):
             try:
-                response = requests.get(
+                response = self._session.get(
                     STOCKBIT_RUNNING_TRADE_URL,
                     params=params,
-                    headers=headers,
                     timeout=30
                 )
                 
                 # handle unauthorized - token expired or invalid
                 if response.status_code == 401:
-                    self.token_manager.mark_token_invalid()
+                    self._handle_unauthorized(token)
                     return {
                         'success': False,
                         'error': 'Token expired or invalid. Please enter a new token.',
@@ -94,20 +301,34 @@ class StockbitClient:
                         'requires_login': True
                     }
                 
+                # handle rate limiting - the one 4xx worth waiting out
+                if response.status_code == 429:
+                    if attempt < retry_count - 1:
+                        delay = _backoff_delay(attempt, response.headers.get('Retry-After'))
+                        logger.warning(f"Rate limited on {ticker} {date}, retrying in {delay:.1f}s")
+                        time.sleep(delay)
+                        continue
+                    return {
+                        'success': False,
+                        'error': f'Rate limited after {retry_count} attempts',
+                        'status_code': 429
+                    }
+                
                 # handle other 4xx errors (don't retry)
                 if 400 <= response.status_code < 500:
                     return {
                         'success': False,
                         'error': f'Client error: {response.status_code}',
                         'status_code': response.status_code,
-                        'response_text': response.text[:500]  # first 500 chars for debugging
+                        'response_text': response.content[:500].decode('utf-8', 'replace')  # first 500 bytes for debugging
                     }
                 
                 # handle 5xx errors (retry with backoff)
                 if response.status_code >= 500:
                     if attempt < retry_count - 1:
-                        wait_time = DEFAULT_RETRY_BACKOFF ** attempt
-                        time.sleep(wait_time)
+                        time.sleep(_backoff_delay(
+                            attempt, response.headers.get('Retry-After')
+                        ))
                         continue
                     return {
                         'success': False,
@@ -117,39 +338,23 @@ class StockbitClient:
                 
                 # success
                 response.raise_for_status()
-                data = response.json()
-                
-                # extract running_trade list
-                running_trade = []
-                if 'data' in data and isinstance(data['data'], dict):
-                    running_trade = data['data'].get('running_trade', [])
-                    is_open_market = data['data'].get('is_open_market', False)
-                else:
-                    # fallback if structure is different
-                    running_trade = data.get('running_trade', [])
-                    is_open_market = data.get('is_open_market', False)
-                
-                return {
-                    'success': True,
-                    'data': running_trade,
-                    'is_open_market': is_open_market,
-                    'count': len(running_trade),
-                    'ticker': ticker,
-                    'date': date
-                }
+                if not self._encoding_logged:
+                    self._encoding_logged = True
+                    logger.info(f"Running trade responses use Content-Encoding: {response.headers.get('Content-Encoding', 'identity')}")
+                return self._parse_page(_json_loads(response.content), ticker, date)
                 
             except requests.Timeout:
                 if attempt < retry_count - 1:
-                    time.sleep(DEFAULT_RETRY_BACKOFF ** attempt)
+                    time.sleep(_backoff_delay(attempt))
                     continue
                 return {
                     'success': False,
                     'error': f'Request timeout after {retry_count} attempts'
                 }
             
-            except requests.RequestException as e:
+            except (requests.RequestException, ValueError) as e:  # ValueError: bad JSON body
                 if attempt < retry_count - 1:
-                    time.sleep(DEFAULT_RETRY_BACKOFF ** attempt)
+                    time.sleep(_backoff_delay(attempt))
                     continue
                 return {
                     'success': False,
@@ -167,7 +372,8 @@ class StockbitClient:
         date: str,
         limit: int = DEFAULT_LIMIT,
         retry_count: int = DEFAULT_RETRY_COUNT,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        page_callback: Optional[Callable[[List[Dict[str, Any]]], None]] = None
     ) -> Dict[str, Any]:
         """
         Fetch ALL running trade data for a ticker on a specific date
@@ -179,6 +385,9 @@ class StockbitClient:
             limit: Max records to fetch per page (default 50)
             retry_count: Number of retry attempts per page
             progress_callback: Optional callback(page, total_records) for progress updates
+            page_callback: Optional callback(page_trades) called with each page as it
+                arrives; when given, trades are streamed out instead of collected and
+                the returned 'data' is empty
         
         Returns:
             Dict with success status, all data combined, and error info
@@ -186,17 +395,19 @@ class StockbitClient:
         logger.info(f"Fetching ALL trades for {ticker} on {date}")
         
         all_trades = []
+        total = 0
         page = 1
         last_trade_number = None
         
         while True:
             # report progress
             if progress_callback:
-                progress_callback(page, len(all_trades))
+                progress_callback(page, total)
             
             # fetch a page
             logger.info(f"Fetching page {page} for {ticker} {date} (last_trade_number: {last_trade_number})")
             
+            self._limiter.acquire()
             result = self._fetch_page(
                 ticker=ticker,
                 date=date,
@@ -208,12 +419,12 @@ class StockbitClient:
             # check for errors
             if not result.get('success'):
                 # if we already have some data, return what we got
-                if all_trades:
-                    logger.warning(f"Error on page {page}, but returning {len(all_trades)} trades collected so far")
+                if total:
+                    logger.warning(f"Error on page {page}, but returning {total} trades collected so far")
                     return {
                         'success': True,
                         'data': all_trades,
-                        'count': len(all_trades),
+                        'count': total,
                         'ticker': ticker,
                         'date': date,
                         'pages_fetched': page - 1,
@@ -228,11 +439,15 @@ class StockbitClient:
             
             # no more data? we're done
             if not page_trades:
-                logger.info(f"No more trades on page {page}. Total collected: {len(all_trades)}")
+                logger.info(f"No more trades on page {page}. Total collected: {total}")
                 break
             
-            # add to our collection
-            all_trades.extend(page_trades)
+            # hand the page off, or add it to our collection
+            if page_callback:
+                page_callback(page_trades)
+            else:
+                all_trades.extend(page_trades)
+            total += len(page_trades)
             
             # get earliest timestamp from this page for monitoring
             earliest_time = 'N/A'
@@ -240,7 +455,7 @@ class StockbitClient:
                 last_trade = page_trades[-1]
                 earliest_time = last_trade.get('time', 'N/A')
             
-            logger.info(f"Page {page}: got {len(page_trades)} trades. Total: {len(all_trades)} | Earliest: {earliest_time}")
+            logger.info(f"Page {page}: got {len(page_trades)} trades. Total: {total} | Earliest: {earliest_time}")
             
             # if we got fewer than the limit, we've reached the end
             if len(page_trades) < limit:
@@ -253,8 +468,8 @@ class StockbitClient:
                 last_trade = page_trades[-1]
                 
                 # check if we've reached 09:00 - stop collecting before market open
-                trade_time = last_trade.get('time', '')
-                if trade_time and trade_time <= '09:00:00':
+                trade_time = _reached_market_open(page_trades)
+                if trade_time:
                     logger.info(f"Reached trade at {trade_time} (before 09:00). Stopping pagination.")
                     break
                 
@@ -267,9 +482,189 @@ class StockbitClient:
                     break
             
             page += 1
+        
+        logger.info(f"[OK] Completed fetching {ticker} {date}: {total} total trades across {page} pages")
+        
+        return {
+            'success': True,
+            'data': all_trades,
+            'count': total,
+            'ticker': ticker,
+            'date': date,
+            'pages_fetched': page
+        }
+
+
+    # ---- async pipeline (optional, needs aiohttp) ----
+    
+    async def _fetch_page_async(
+        self,
+        session: 'aiohttp.ClientSession',
+        ticker: str,
+        date: str,
+        limit: int = DEFAULT_LIMIT,
+        trade_number: Optional[int] = None,
+        retry_count: int = DEFAULT_RETRY_COUNT
+    ) -> Dict[str, Any]:
+        """Async twin of _fetch_page running on a shared aiohttp session"""
+        token = await self._get_token_async()
+        if not token:
+            return {
+                'success': False,
+                'error': 'No valid token available. Please set your Bearer token.',
+                'requires_login': True
+            }
+        
+        params = self._build_params(ticker, date, limit, trade_number)
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        for attempt in range(retry_count):
+            try:
+                async with session.get(
+                    STOCKBIT_RUNNING_TRADE_URL,
+                    params=params,
+                    headers=headers
+                ) as response:
+                    status = response.status
+                    
+                    if status == 401:
+                        self._handle_unauthorized(token)
+                        return {
+                            'success': False,
+                            'error': 'Token expired or invalid. Please enter a new token.',
+                            'status_code': 401,
+                            'requires_login': True
+                        }
+                    
+                    if status == 403:
+                        return {
+                            'success': False,
+                            'error': 'Access forbidden. Token might need refresh.',
+                            'status_code': 403,
+                            'requires_login': True
+                        }
+                    
+                    if status == 429:
+                        if attempt < retry_count - 1:
+                            delay = _backoff_delay(attempt, response.headers.get('Retry-After'))
+                            logger.warning(f"Rate limited on {ticker} {date}, retrying in {delay:.1f}s")
+                            await asyncio.sleep(delay)
+                            continue
+                        return {
+                            'success': False,
+                            'error': f'Rate limited after {retry_count} attempts',
+                            'status_code': 429
+                        }
+                    
+                    if 400 <= status < 500:
+                        body = await response.read()
+                        return {
+                            'success': False,
+                            'error': f'Client error: {status}',
+                            'status_code': status,
+                            'response_text': body[:500].decode('utf-8', 'replace')
+                        }
+                    
+                    if status >= 500:
+                        if attempt < retry_count - 1:
+                            await asyncio.sleep(_backoff_delay(
+                                attempt, response.headers.get('Retry-After')
+                            ))
+                            continue
+                        return {
+                            'success': False,
+                            'error': f'Server error after {retry_count} attempts',
+                            'status_code': status
+                        }
+                    
+                    data = _json_loads(await response.read())
+                    return self._parse_page(data, ticker, date)
             
-            # small delay between pages to be nice to the API
-            time.sleep(0.5)
+            except asyncio.TimeoutError:
+                if attempt < retry_count - 1:
+                    await asyncio.sleep(_backoff_delay(attempt))
+                    continue
+                return {
+                    'success': False,
+                    'error': f'Request timeout after {retry_count} attempts'
+                }
+            
+            except (aiohttp.ClientError, ValueError) as e:
+                if attempt < retry_count - 1:
+                    await asyncio.sleep(_backoff_delay(attempt))
+                    continue
+                return {
+                    'success': False,
+                    'error': f'Request failed: {str(e)}'
+                }
+        
+        return {
+            'success': False,
+            'error': 'Unknown error after all retry attempts'
+        }
+    
+    async def fetch_running_trade_async(
+        self,
+        session: 'aiohttp.ClientSession',
+        ticker: str,
+        date: str,
+        limit: int = DEFAULT_LIMIT,
+        retry_count: int = DEFAULT_RETRY_COUNT
+    ) -> Dict[str, Any]:
+        """
+        Async version of fetch_running_trade
+        
+        Pages within one ticker-date stay sequential (each page needs the
+        previous trade_number); concurrency comes from running many
+        ticker-dates side by side in fetch_many.
+        """
+        all_trades = []
+        page = 1
+        last_trade_number = None
+        
+        while True:
+            await self._limiter.acquire_async()
+            result = await self._fetch_page_async(
+                session, ticker, date,
+                limit=limit,
+                trade_number=last_trade_number,
+                retry_count=retry_count
+            )
+            
+            if not result.get('success'):
+                if all_trades:
+                    logger.warning(f"Error on page {page}, but returning {len(all_trades)} trades collected so far")
+                    return {
+                        'success': True,
+                        'data': all_trades,
+                        'count': len(all_trades),
+                        'ticker': ticker,
+                        'date': date,
+                        'pages_fetched': page - 1,
+                        'partial': True
+                    }
+                return result
+            
+            page_trades = result.get('data', [])
+            if not page_trades:
+                break
+            
+            all_trades.extend(page_trades)
+            
+            if len(page_trades) < limit:
+                break
+            
+            if _reached_market_open(page_trades):
+                break
+            
+            last_trade = page_trades[-1]
+            
+            if 'trade_number' not in last_trade:
+                logger.warning(f"No trade_number field in response. Stopping pagination.")
+                break
+            last_trade_number = last_trade['trade_number']
+            
+            page += 1
         
         logger.info(f"[OK] Completed fetching {ticker} {date}: {len(all_trades)} total trades across {page} pages")
         
@@ -281,4 +676,93 @@ class StockbitClient:
             'date': date,
             'pages_fetched': page
         }
-
+    
+    def _open_aio_session(self) -> 'aiohttp.ClientSession':
+        """Create the shared aiohttp session for one async fetch run"""
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp not installed. Install with: pip install aiohttp")
+        
+        # asyncio locks bind to the running loop, so make one per run
+        self._token_lock = asyncio.Lock()
+        connector = aiohttp.TCPConnector(limit=32, limit_per_host=8, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=30)
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers=HEADERS_TEMPLATE
+        )
+    
+    async def fetch_many(
+        self,
+        jobs: List[Tuple[str, str]],
+        limit: int = DEFAULT_LIMIT,
+        retry_count: int = DEFAULT_RETRY_COUNT
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch several (ticker, date) pairs concurrently over one aiohttp session
+        
+        Returns one result dict per job, in the same order as jobs.
+        """
+        async with self._open_aio_session() as session:
+            return await asyncio.gather(*[
+                self.fetch_running_trade_async(session, ticker, date, limit, retry_count)
+                for ticker, date in jobs
+            ])
+    
+    def fetch_many_sync(
+        self,
+        jobs: List[Tuple[str, str]],
+        limit: int = DEFAULT_LIMIT,
+        retry_count: int = DEFAULT_RETRY_COUNT
+    ) -> List[Dict[str, Any]]:
+        """Blocking wrapper around fetch_many for thread-based callers"""
+        return asyncio.run(self.fetch_many(jobs, limit, retry_count))
+    
+    async def fetch_bulk(
+        self,
+        jobs: List[Tuple[str, str]],
+        workers: int = 8,
+        batch_threshold: int = 4,
+        max_batch: int = 4,
+        limit: int = DEFAULT_LIMIT,
+        retry_count: int = DEFAULT_RETRY_COUNT
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch a large (ticker, date) grid with a fixed pool of queue workers
+        
+        Unlike fetch_many, at most workers * max_batch ticker-dates are in
+        flight at once. A free worker takes one job when the queue is short,
+        or up to max_batch jobs when batch_threshold or more are waiting, so
+        the concurrent window widens only while there is a backlog.
+        
+        Returns one result dict per job, in the same order as jobs.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for index, job in enumerate(jobs):
+            queue.put_nowait((index, job))
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        
+        async def worker(session):
+            while True:
+                try:
+                    batch = [queue.get_nowait()]
+                except asyncio.QueueEmpty:
+                    return
+                if queue.qsize() >= batch_threshold:
+                    while len(batch) < max_batch and not queue.empty():
+                        batch.append(queue.get_nowait())
+                
+                outcomes = await asyncio.gather(*[
+                    self.fetch_running_trade_async(session, ticker, date, limit, retry_count)
+                    for _, (ticker, date) in batch
+                ])
+                for (index, _), outcome in zip(batch, outcomes):
+                    results[index] = outcome
+        
+        async with self._open_aio_session() as session:
+            await asyncio.gather(*[
+                asyncio.create_task(worker(session))
+                for _ in range(min(workers, len(jobs)))
+            ])
+        
+        return results
@@ -2,27 +2,61 @@
 Data storage module for CSV export
 """
 import csv
+import os
+import shutil
+import tempfile
+import threading
+from itertools import repeat
 from pathlib import Path
 from typing import List, Dict, Any
 from datetime import datetime
-from config import DATA_DIR, CSV_COLUMNS, CSV_APPEND_MODE
+from config import DATA_DIR, CSV_COLUMNS, CSV_APPEND_MODE, OUTPUT_FORMAT
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# deletion tables for cleaning price/change in one C-level pass
+_PRICE_TBL = str.maketrans('', '', ',')
+_CHANGE_TBL = str.maketrans('', '', '%+')
+
+# large write buffer so a day's rows go out in a handful of syscalls
+_WRITE_BUFFER = 1 << 20
 
 class CSVStorage:
     """Handles CSV file operations for trade data"""
     
+    FILE_SUFFIX = '.csv'
+    
     def __init__(self):
         self.data_dir = DATA_DIR
         self.data_dir.mkdir(exist_ok=True)
+        # one lock per output file: parallel job workers write different
+        # dates of a ticker into the same range file
+        self._file_locks: Dict[Path, threading.Lock] = {}
+        self._file_locks_guard = threading.Lock()
+    
+    def _file_lock(self, filename: Path) -> threading.Lock:
+        """Lock serializing all writes to filename"""
+        with self._file_locks_guard:
+            lock = self._file_locks.get(filename)
+            if lock is None:
+                lock = self._file_locks[filename] = threading.Lock()
+            return lock
     
     def get_filename(self, ticker: str, from_date: str, until_date: str) -> Path:
-        """Generate CSV filename for ticker and date range"""
+        """Generate output filename for ticker and date range"""
         # using single file per ticker for date range
-        filename = f"{ticker}_{from_date}_{until_date}.csv"
+        filename = f"{ticker}_{from_date}_{until_date}{self.FILE_SUFFIX}"
         return self.data_dir / filename
     
     def get_daily_filename(self, ticker: str, date: str) -> Path:
-        """Generate CSV filename for ticker and single date"""
-        filename = f"{ticker}_{date}.csv"
+        """Generate output filename for ticker and single date"""
+        filename = f"{ticker}_{date}{self.FILE_SUFFIX}"
         return self.data_dir / filename
     
     def save_trades(
@@ -58,32 +92,18 @@ class CSVStorage:
             filename = self.get_daily_filename(ticker, date)
         
         try:
-            # check if file exists
-            file_exists = filename.exists()
-            mode = 'a' if (append and file_exists) else 'w'
-            
-            with open(filename, mode, newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS, extrasaction='ignore')
-                
-                # write header if new file or overwrite mode
-                if mode == 'w' or not file_exists:
-                    writer.writeheader()
+            with self._file_lock(filename):
+                # check if file exists
+                file_exists = filename.exists()
+                mode = 'a' if (append and file_exists) else 'w'
                 
-                # write rows
-                rows_written = 0
-                for trade in trades:
-                    # add date field
-                    trade['date'] = date
+                with open(filename, mode, newline='', encoding='utf-8', buffering=_WRITE_BUFFER) as f:
+                    # write header if new file or overwrite mode
+                    if mode == 'w' or not file_exists:
+                        csv.writer(f).writerow(CSV_COLUMNS)
                     
-                    # clean price and change fields (remove commas)
-                    if 'price' in trade:
-                        trade['price'] = str(trade['price']).replace(',', '')
-                    if 'change' in trade:
-                        trade['change'] = str(trade['change']).replace('%', '').replace('+', '')
-                    
-                    # write row
-                    writer.writerow(trade)
-                    rows_written += 1
+                    # write rows
+                    rows_written = self._write_rows(f, trades, date)
             
             return {
                 'success': True,
@@ -98,17 +118,66 @@ class CSVStorage:
                 'error': f'Failed to write CSV: {str(e)}'
             }
     
+    @staticmethod
+    def _clean_trade(trade: Dict[str, Any], date: str) -> Dict[str, Any]:
+        """Add the date and strip formatting from price/change, in place"""
+        # add date field
+        trade['date'] = date
+        
+        # clean price and change fields (remove commas)
+        if 'price' in trade:
+            trade['price'] = str(trade['price']).translate(_PRICE_TBL)
+        if 'change' in trade:
+            trade['change'] = str(trade['change']).translate(_CHANGE_TBL)
+        
+        return trade
+    
+    def _write_rows(self, f, trades: List[Dict[str, Any]], date: str) -> int:
+        """Clean and write trades as CSV_COLUMNS-ordered rows"""
+        # the column order is fixed, so build plain lists for csv.writer
+        # instead of paying DictWriter's per-row dict-to-list conversion
+        columns = CSV_COLUMNS
+        csv.writer(f).writerows(
+            [trade.get(column, '') for column in columns]
+            for trade in map(self._clean_trade, trades, repeat(date))
+        )
+        return len(trades)
+    
+    def open_session(
+        self,
+        ticker: str,
+        date: str,
+        filename: Path = None
+    ) -> '_CSVWriterSession':
+        """
+        Open a CSV once for streaming writes of one ticker-date
+        
+        Use as a context manager; pass the session's write() as the fetcher's
+        page callback so every page goes through the same open file handle,
+        then call commit() once the fetch succeeded. Pages are staged in a
+        private temp file and only appended to filename on commit, so a
+        failed or retried fetch leaves nothing behind. Sessions always append:
+        several dates of a job share one range file.
+        """
+        if filename is None:
+            filename = self.get_daily_filename(ticker, date)
+        return _CSVWriterSession(self, filename, date)
+    
     def list_output_files(self) -> List[Dict[str, Any]]:
-        """List all CSV files in data directory"""
+        """List all output files of this storage's format in data directory"""
         files = []
-        for filepath in self.data_dir.glob('*.csv'):
-            stat = filepath.stat()
-            files.append({
-                'filename': filepath.name,
-                'path': str(filepath),
-                'size_bytes': stat.st_size,
-                'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
-            })
+        # scandir entries carry d_type, so is_file() needs no extra syscall
+        with os.scandir(self.data_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(self.FILE_SUFFIX) or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                files.append({
+                    'filename': entry.name,
+                    'path': entry.path,
+                    'size_bytes': stat.st_size,
+                    'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
+                })
         
         # sort by modified time desc
         files.sort(key=lambda x: x['modified'], reverse=True)
@@ -118,3 +187,246 @@ class CSVStorage:
         """Get full path for a filename"""
         return self.data_dir / filename
 
+
+class _CSVWriterSession:
+    """
+    One ticker-date's CSV kept open across pages
+    
+    Rows go to a temp file next to the target, opened lazily on the first
+    non-empty write. commit() appends the staged rows to the target under
+    the storage's per-file lock, so concurrent sessions for the same file
+    never interleave; leaving the session without committing discards them.
+    """
+    
+    def __init__(self, storage: CSVStorage, filename: Path, date: str):
+        self.storage = storage
+        self.filename = filename
+        self.date = date
+        self.rows_written = 0
+        self._file = None
+    
+    def write(self, trades: List[Dict[str, Any]]) -> int:
+        """Clean and stage a batch of trades; returns rows written"""
+        if not trades:
+            return 0
+        if self._file is None:
+            self._file = tempfile.NamedTemporaryFile(
+                'w', newline='', encoding='utf-8', buffering=_WRITE_BUFFER,
+                dir=self.filename.parent, prefix=f".{self.filename.name}.",
+                suffix='.part', delete=False
+            )
+        written = self.storage._write_rows(self._file, trades, self.date)
+        self.rows_written += written
+        return written
+    
+    def commit(self):
+        """Append the staged rows to the target file"""
+        if self._file is None:
+            return
+        staged = self._file
+        self._file = None
+        try:
+            staged.close()
+            with self.storage._file_lock(self.filename):
+                # always O_APPEND; the header goes in only while the file is empty
+                with open(self.filename, 'a', newline='', encoding='utf-8', buffering=_WRITE_BUFFER) as f:
+                    if f.tell() == 0:
+                        csv.writer(f).writerow(CSV_COLUMNS)
+                    with open(staged.name, newline='', encoding='utf-8') as rows:
+                        shutil.copyfileobj(rows, f, _WRITE_BUFFER)
+        finally:
+            os.unlink(staged.name)
+    
+    def close(self):
+        """Discard rows that were never committed"""
+        if self._file is not None:
+            self._file.close()
+            os.unlink(self._file.name)
+            self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ParquetStorage(CSVStorage):
+    """Writes trade data as zstd-compressed Parquet for analytical consumers"""
+    
+    FILE_SUFFIX = '.parquet'
+    
+    # typed columns; low-cardinality codes are dictionary-encoded
+    _INT32_COLUMNS = ('price', 'lot')
+    _INT64_COLUMNS = ('trade_number',)
+    _FLOAT32_COLUMNS = ('change',)
+    _DICT_COLUMNS = ('action', 'code', 'buyer', 'seller', 'buyer_type', 'seller_type', 'market_board')
+    
+    # values that cast cleanly; anything else ('-', '1.000', ...) becomes null
+    _INT_PATTERN = r'^-?[0-9]+$'
+    _FLOAT_PATTERN = r'^[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?$'
+    _DATE_PATTERN = r'^[0-9]{4}-[0-9]{2}-[0-9]{2}$'
+    
+    def __init__(self):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow not installed. Install with: pip install pyarrow")
+        super().__init__()
+    
+    @staticmethod
+    def _cast_valid(col: 'pa.Array', pattern: str, type_: 'pa.DataType') -> 'pa.Array':
+        """Cast col to type_, nulling values that don't match pattern"""
+        valid = pc.match_substring_regex(col, pattern)
+        return pc.if_else(valid, col, pa.scalar(None, pa.string())).cast(type_, safe=False)
+    
+    def _to_table(self, trades: List[Dict[str, Any]], date: str) -> 'pa.Table':
+        """Build a typed Arrow table from raw trade dicts"""
+        rows = [CSVStorage._clean_trade(trade, date) for trade in trades]
+        columns = {}
+        for name in CSV_COLUMNS:
+            # go through strings so API values like '1,234' or '' parse uniformly
+            values = []
+            for row in rows:
+                value = row.get(name)
+                if value is None or value == '':
+                    values.append(None)
+                elif name in self._INT32_COLUMNS:
+                    values.append(str(value).translate(_PRICE_TBL))
+                else:
+                    values.append(str(value))
+            col = pa.array(values, type=pa.string())
+            
+            if name in self._INT32_COLUMNS:
+                col = self._cast_valid(col, self._INT_PATTERN, pa.int32())
+            elif name in self._INT64_COLUMNS:
+                col = self._cast_valid(col, self._INT_PATTERN, pa.int64())
+            elif name in self._FLOAT32_COLUMNS:
+                col = self._cast_valid(col, self._FLOAT_PATTERN, pa.float32())
+            elif name == 'date':
+                col = self._cast_valid(col, self._DATE_PATTERN, pa.date32())
+            elif name in self._DICT_COLUMNS:
+                col = col.dictionary_encode()
+            columns[name] = col
+        
+        return pa.table(columns)
+    
+    def _write_table(self, filename: Path, table: 'pa.Table', append: bool) -> str:
+        """Write table to filename, appending to an existing file; returns mode"""
+        with self._file_lock(filename):
+            mode = 'w'
+            if append and filename.exists():
+                existing = pq.read_table(filename)
+                table = pa.concat_tables([existing, table.cast(existing.schema)])
+                mode = 'a'
+            
+            pq.write_table(
+                table, filename,
+                compression='zstd',
+                use_dictionary=True,
+                row_group_size=65536
+            )
+        return mode
+    
+    def save_trades(
+        self,
+        ticker: str,
+        date: str,
+        trades: List[Dict[str, Any]],
+        filename: Path = None,
+        append: bool = CSV_APPEND_MODE
+    ) -> Dict[str, Any]:
+        """
+        Save trade data to Parquet
+        
+        Parquet files can't be appended in place, so append mode reads the
+        existing file and rewrites it with the new rows at the end.
+        
+        Returns:
+            Dict with success status and info
+        """
+        if not trades:
+            return {
+                'success': True,
+                'message': 'No trades to save',
+                'rows_written': 0
+            }
+        
+        if filename is None:
+            filename = self.get_daily_filename(ticker, date)
+        
+        try:
+            mode = self._write_table(filename, self._to_table(trades, date), append)
+            return {
+                'success': True,
+                'filename': str(filename),
+                'rows_written': len(trades),
+                'mode': mode
+            }
+        
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Failed to write Parquet: {str(e)}'
+            }
+    
+    def open_session(
+        self,
+        ticker: str,
+        date: str,
+        filename: Path = None
+    ) -> '_ParquetWriterSession':
+        """
+        Collect one ticker-date's pages and append them to Parquet on commit
+        
+        Same contract as CSVStorage.open_session; pages are kept as Arrow
+        tables and the file is rewritten once per committed date.
+        """
+        if filename is None:
+            filename = self.get_daily_filename(ticker, date)
+        return _ParquetWriterSession(self, filename, date)
+
+
+class _ParquetWriterSession:
+    """
+    One ticker-date's pages staged as Arrow tables
+    
+    commit() appends them to the target under the storage's per-file lock;
+    leaving the session without committing discards them.
+    """
+    
+    def __init__(self, storage: ParquetStorage, filename: Path, date: str):
+        self.storage = storage
+        self.filename = filename
+        self.date = date
+        self.rows_written = 0
+        self._tables: List['pa.Table'] = []
+    
+    def write(self, trades: List[Dict[str, Any]]) -> int:
+        """Clean and stage a batch of trades; returns rows written"""
+        if not trades:
+            return 0
+        self._tables.append(self.storage._to_table(trades, self.date))
+        self.rows_written += len(trades)
+        return len(trades)
+    
+    def commit(self):
+        """Append the staged rows to the target file"""
+        if self._tables:
+            self.storage._write_table(self.filename, pa.concat_tables(self._tables), append=True)
+        self._tables = []
+    
+    def close(self):
+        """Discard rows that were never committed"""
+        self._tables = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def create_storage() -> CSVStorage:
+    """Storage for the configured OUTPUT_FORMAT"""
+    if OUTPUT_FORMAT == 'parquet':
+        return ParquetStorage()
+    return CSVStorage()
@@ -3,27 +3,242 @@ Telegram Bot for Orderbook Daemon control, historical trade job management,
 Google Drive upload scheduling, and monitoring notifications.
 """
 import asyncio
+import functools
+import heapq
 import os
+import random
+import re
 import threading
+import time
 import logging
 import uuid
-from datetime import datetime, time as dt_time, timedelta
+from html import escape
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from datetime import date, datetime, time as dt_time, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
+
 logger = logging.getLogger(__name__)
 
 try:
     from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+    from telegram.error import BadRequest, NetworkError, RetryAfter, TimedOut
     from telegram.ext import (
         Application, CommandHandler, CallbackQueryHandler,
         ContextTypes, MessageHandler, filters
     )
+    from telegram.request import HTTPXRequest
     TELEGRAM_AVAILABLE = True
 except ImportError:
     TELEGRAM_AVAILABLE = False
     logger.warning("python-telegram-bot not installed. Install with: pip install python-telegram-bot>=21.0")
 
+# every Bot API reply (the sent Message for each send/edit, each getUpdates
+# batch) is JSON; orjson decodes it straight from bytes
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# scheduled jobs reason in WIB dates (Indonesia has no DST, so a fixed offset)
+_WIB = timezone(timedelta(hours=7), 'WIB')
+
+_STATE_EMOJIS = {
+    'streaming': '🟢', 'waiting_market': '🟡', 'market_closed': '🌙',
+    'paused': '⏸️', 'error': '🔴', 'no_tickers': '📋',
+}
+
+_JOB_STATUS_ICONS = {
+    'QUEUED': '🔵', 'RUNNING': '🟢', 'PAUSED': '🟡',
+    'COMPLETED': '✅', 'FAILED': '🔴',
+}
+
+# static reply texts, formatted with the few runtime values they need
+_START_TEMPLATE = (
+    "*Orderbook Streaming Bot*\n\n"
+    "Your Chat ID: `{chat_id}`\n\n"
+    "Use /help to see available commands.\n"
+    "Use /status for current daemon status.\n"
+)
+
+_HELP_TEMPLATE = (
+    "*Available Commands*\n\n"
+    "*Status & Info*\n"
+    "/status - Daemon & market status\n"
+    "/heartbeat - Connection health check\n"
+    "/recap - Today's trading recap\n\n"
+    "*Ticker Management*\n"
+    "/tickers - View current tickers\n"
+    "/settickers BBCA TLKM - Replace all\n"
+    "/addticker BBCA - Add ticker(s)\n"
+    "/removeticker BBCA - Remove ticker(s)\n\n"
+    "*Stream Control*\n"
+    "/pause - Pause streaming\n"
+    "/resume - Resume streaming\n\n"
+    "*Authentication*\n"
+    "/settoken <token> - Set bearer token\n\n"
+    "*Historical Trade Jobs*\n"
+    "/jobs - List recent jobs\n"
+    "/newjob BBCA,TLKM 2026-01-01 2026-01-31 - Create job\n"
+    "/jobstatus <id> - Job details\n"
+    "/pausejob <id> - Pause a job\n"
+    "/resumejob <id> - Resume a job\n"
+    "/canceljob <id> - Cancel a job\n\n"
+    "*Settings*\n"
+    "/setheartbeat <min> - Change heartbeat interval (now {hb}m)\n\n"
+    "*Scheduled*\n"
+    "  Heartbeat: every {hb} min\n"
+    "  Token reminder: 07:30 WIB\n"
+    "  Pre-market: 08:25 WIB\n"
+    "  Daily recap: 16:30 WIB\n"
+    "  GDrive upload: 16:15 WIB + 00:05 WIB\n"
+)
+
+# YYYY-MM-DD with plausible month/day; date() then rejects e.g. Feb 30
+_DATE_RE = re.compile(r'^(\d{4})-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])$')
+
+_NEW_JOB_USAGE = (
+    "*Create Historical Trade Job*\n\n"
+    "Usage: `/newjob TICKERS FROM TO [delay] [limit]`\n\n"
+    "Example:\n`/newjob BBCA,TLKM 2026-01-01 2026-01-31`\n"
+    "`/newjob BBRI 2026-02-01 2026-02-15 2 100`"
+)
+
+# stay under Telegram's 4096-char message cap with room for entity overhead
+_MESSAGE_CHUNK_LIMIT = 3800
+
+
+def _chunks(lines, limit=_MESSAGE_CHUNK_LIMIT):
+    """Join lines into as few messages as fit within limit characters each.
+
+    Lines are never split, so HTML tags inside a line stay balanced; a single
+    line longer than limit is sent as its own message.
+    """
+    chunks = []
+    current = []
+    size = 0
+    for line in lines:
+        if current and size + len(line) > limit:
+            chunks.append(''.join(current))
+            current = []
+            size = 0
+        current.append(line)
+        size += len(line)
+    if current or not chunks:
+        chunks.append(''.join(current))
+    return chunks
+
+
+@functools.lru_cache(maxsize=4096)
+def _uptime_text(seconds: int) -> str:
+    """Render whole seconds as '45s', '12m 5s' or '3h 20m'.
+
+    Cached because heartbeats and job events format the same few thousand
+    uptime values over and over.
+    """
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+
+
+# retries for Bot API calls hitting flood control or network errors
+_SEND_RETRIES = 3
+_SEND_BACKOFF_MAX = 30.0
+
+# busiest tickers listed in the scheduled daily recap
+_RECAP_TOP_TICKERS = 15
+
+# identical state-change / reconnect alerts inside these windows are dropped
+_STATE_ALERT_DEDUPE_SECS = 30
+_RECONNECT_ALERT_DEDUPE_SECS = 60
+
+# notification sends allowed in flight at once
+_MAX_CONCURRENT_SENDS = 5
+
+# how long an instance-marker check is trusted before looking again
+_ACTIVE_CHECK_TTL = 5.0
+
+# job_progress events arriving within this window go out as one edit
+_PROGRESS_FLUSH_DELAY = 1.5
+
+# job event messages (HTML): (template, defaults for keys the event may omit)
+_JOB_EVENT_TEMPLATES = {
+    'job_started': (
+        "<b>Job Started</b>\n\n"
+        "ID: <code>{short_id}</code>\n"
+        "Tickers: {tickers_joined}\n"
+        "Range: {from_date} to {until_date}\n"
+        "Tasks: {total_tasks}",
+        {'from_date': None, 'until_date': None, 'total_tasks': '?'},
+    ),
+    'job_progress': (
+        "<b>Job Progress</b>\n\n"
+        "ID: <code>{short_id}</code> — {percentage:.0f}%\n"
+        "Completed: {completed}/{total}\n"
+        "Failed: {failed}",
+        {'percentage': 0, 'completed': 0, 'total': 0, 'failed': 0},
+    ),
+    'job_completed': (
+        "<b>Job Completed</b>\n\n"
+        "ID: <code>{short_id}</code>\n"
+        "Tickers: {tickers_joined}\n"
+        "Tasks: {completed_tasks}/{total_tasks}\n"
+        "Records: {total_records:,}\n"
+        "Failed: {failed_tasks}"
+        "{elapsed}",
+        {'completed_tasks': 0, 'total_tasks': 0, 'total_records': 0, 'failed_tasks': 0},
+    ),
+    'job_failed': (
+        "<b>Job Failed</b>\n\n"
+        "ID: <code>{short_id}</code>\n"
+        "Tickers: {tickers_joined}\n"
+        "Error: {error}",
+        {'error': 'Unknown'},
+    ),
+    'job_paused': (
+        "<b>Job Paused</b>\n\n"
+        "ID: <code>{short_id}</code>\n"
+        "Tickers: {tickers_joined}\n"
+        "Reason: {reason}",
+        {'reason': 'Unknown'},
+    ),
+}
+
+# keyboards never change, so build them once (PTB objects are immutable)
+if TELEGRAM_AVAILABLE:
+    _PAUSE_ROW = [InlineKeyboardButton("⏸ Pause", callback_data="pause")]
+    _RESUME_ROW = [InlineKeyboardButton("▶️ Resume", callback_data="resume")]
+    _REFRESH_ROW = [InlineKeyboardButton("🔄 Refresh", callback_data="refresh_status")]
+    _STATUS_KEYBOARD = InlineKeyboardMarkup([_REFRESH_ROW])
+    _STATUS_KEYBOARD_STREAMING = InlineKeyboardMarkup([_PAUSE_ROW, _REFRESH_ROW])
+    _STATUS_KEYBOARD_PAUSED = InlineKeyboardMarkup([_RESUME_ROW, _REFRESH_ROW])
+    _REPLACE_TICKERS_KEYBOARD = InlineKeyboardMarkup(
+        [[InlineKeyboardButton("Replace All", callback_data="prompt_set_tickers")]])
+    _VIEW_TICKERS_KEYBOARD = InlineKeyboardMarkup(
+        [[InlineKeyboardButton("View Tickers", callback_data="refresh_status")]])
+    _CHECK_STATUS_KEYBOARD = InlineKeyboardMarkup(
+        [[InlineKeyboardButton("Check Status", callback_data="refresh_status")]])
+    _SET_TOKEN_KEYBOARD = InlineKeyboardMarkup(
+        [[InlineKeyboardButton("Set Token", callback_data="prompt_set_token")]])
+
+
+if TELEGRAM_AVAILABLE and ORJSON_AVAILABLE:
+    class _OrjsonRequest(HTTPXRequest):
+        """HTTPXRequest that parses Bot API responses with orjson."""
+
+        @staticmethod
+        def parse_json_payload(payload: bytes) -> dict:
+            try:
+                return orjson.loads(payload)
+            except orjson.JSONDecodeError:
+                # let PTB handle invalid UTF-8 / JSON its own way
+                return HTTPXRequest.parse_json_payload(payload)
+
 
 class TelegramBot:
     """Telegram bot for remote control of the Orderbook Daemon,
@@ -51,12 +266,30 @@ class TelegramBot:
         self.thread = None
         self.running = False
         self._loop = None
+        self._stop_event = None
+        self._upload_lock = None
+        self._send_sem = None
+        # job_id -> {'data': newest unsent job_progress payload, 'message_id': ...,
+        # 'lock': serializes that job's sends}; only touched on the bot's loop
+        self._progress_state = {}
+        self._progress_flush = None  # pending call_later handle
+        # monotonic time each alert was last sent, for flap dedupe
+        self._state_alert_times = {}  # (old, new) state values -> time
+        self._last_reconnect_alert = (None, 0.0)  # (count, time)
+        self._pending_sends = set()
+        self._status_cache = (0.0, None)  # (monotonic time, daemon status)
+        # small fixed pool for blocking daemon/uploader calls; a chat bot
+        # never needs more, and the default pool can grow to 32 threads
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tg-daemon")
         self._last_error = None
         self._bot_info = None
         self._job_queue_available = False
         self._recap_sent_date = None
 
+        self._commands = {}
         self._instance_id = f"{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        self._marker_cache = (None, "")  # (marker mtime_ns, marker content)
+        self._active_cache = (float('-inf'), True)  # (monotonic time, answer)
 
         self.daemon.set_reconnect_callback(self._on_reconnect_alert)
         self.daemon.set_state_change_callback(self._on_state_change)
@@ -73,13 +306,32 @@ class TelegramBot:
         try:
             self._INSTANCE_MARKER.parent.mkdir(parents=True, exist_ok=True)
             self._INSTANCE_MARKER.write_text(self._instance_id)
-            logger.info(f"Claimed active bot instance: {self._instance_id}")
+            self._active_cache = (float('-inf'), True)
+            logger.info("Claimed active bot instance: %s", self._instance_id)
         except Exception as e:
-            logger.warning(f"Could not write instance marker: {e}")
+            logger.warning("Could not write instance marker: %s", e)
 
     def _is_active_instance(self) -> bool:
+        # every scheduled job and notification asks; a takeover by another
+        # instance only needs noticing within a few seconds
+        now = time.monotonic()
+        checked_at, active = self._active_cache
+        if now - checked_at < _ACTIVE_CHECK_TTL:
+            return active
+        active = self._check_marker()
+        self._active_cache = (now, active)
+        return active
+
+    def _check_marker(self) -> bool:
         try:
-            return self._INSTANCE_MARKER.read_text().strip() == self._instance_id
+            # the marker only changes when an instance claims it, so a stat()
+            # is enough to tell whether the cached content is still current
+            mtime = self._INSTANCE_MARKER.stat().st_mtime_ns
+            cached_mtime, content = self._marker_cache
+            if mtime != cached_mtime:
+                content = self._INSTANCE_MARKER.read_text().strip()
+                self._marker_cache = (mtime, content)
+            return content == self._instance_id
         except Exception:
             return True
 
@@ -88,35 +340,52 @@ class TelegramBot:
     # ------------------------------------------------------------------ #
 
     def _build_app(self):
-        builder = Application.builder().token(self.token)
+        # handle updates concurrently so one slow command (token reconnect,
+        # job creation) doesn't hold up every other chat behind it
+        builder = Application.builder().token(self.token).concurrent_updates(True)
+        if ORJSON_AVAILABLE:
+            # same pool sizes the builder would pick for its own requests
+            builder = builder.request(
+                _OrjsonRequest(connection_pool_size=256)
+            ).get_updates_request(_OrjsonRequest(connection_pool_size=1))
         self.app = builder.build()
 
-        # -- orderbook daemon commands --
-        self.app.add_handler(CommandHandler("start", self._cmd_start))
-        self.app.add_handler(CommandHandler("help", self._cmd_help))
-        self.app.add_handler(CommandHandler("status", self._cmd_status))
-        self.app.add_handler(CommandHandler("tickers", self._cmd_tickers))
-        self.app.add_handler(CommandHandler("addticker", self._cmd_add_ticker))
-        self.app.add_handler(CommandHandler("removeticker", self._cmd_remove_ticker))
-        self.app.add_handler(CommandHandler("settickers", self._cmd_set_tickers))
-        self.app.add_handler(CommandHandler("pause", self._cmd_pause))
-        self.app.add_handler(CommandHandler("resume", self._cmd_resume))
-        self.app.add_handler(CommandHandler("settoken", self._cmd_set_token))
-        self.app.add_handler(CommandHandler("recap", self._cmd_recap))
-        self.app.add_handler(CommandHandler("heartbeat", self._cmd_heartbeat))
-        self.app.add_handler(CommandHandler("setheartbeat", self._cmd_set_heartbeat))
-
-        # -- historical trade job commands --
-        self.app.add_handler(CommandHandler("jobs", self._cmd_jobs))
-        self.app.add_handler(CommandHandler("newjob", self._cmd_new_job))
-        self.app.add_handler(CommandHandler("jobstatus", self._cmd_job_status))
-        self.app.add_handler(CommandHandler("pausejob", self._cmd_pause_job))
-        self.app.add_handler(CommandHandler("resumejob", self._cmd_resume_job))
-        self.app.add_handler(CommandHandler("canceljob", self._cmd_cancel_job))
+        # one CommandHandler for every command, dispatched by dict lookup,
+        # instead of a handler per command scanned in turn for each update
+        self._commands = {
+            # -- orderbook daemon commands --
+            "start": self._cmd_start,
+            "help": self._cmd_help,
+            "status": self._cmd_status,
+            "tickers": self._cmd_tickers,
+            "addticker": self._cmd_add_ticker,
+            "removeticker": self._cmd_remove_ticker,
+            "settickers": self._cmd_set_tickers,
+            "pause": self._cmd_pause,
+            "resume": self._cmd_resume,
+            "settoken": self._cmd_set_token,
+            "recap": self._cmd_recap,
+            "heartbeat": self._cmd_heartbeat,
+            "setheartbeat": self._cmd_set_heartbeat,
+            # -- historical trade job commands --
+            "jobs": self._cmd_jobs,
+            "newjob": self._cmd_new_job,
+            "jobstatus": self._cmd_job_status,
+            "pausejob": self._cmd_pause_job,
+            "resumejob": self._cmd_resume_job,
+            "canceljob": self._cmd_cancel_job,
+        }
+        self.app.add_handler(CommandHandler(list(self._commands), self._dispatch_command))
 
         # inline keyboard handler
         self.app.add_handler(CallbackQueryHandler(self._handle_callback))
 
+    async def _dispatch_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        # CommandHandler has already matched the command (and any @botname),
+        # so the first word minus the slash and suffix is a table key
+        command = update.effective_message.text[1:].split(None, 1)[0].split('@', 1)[0].lower()
+        await self._commands[command](update, context)
+
     def _schedule_jobs(self):
         job_queue = self.app.job_queue
 
@@ -130,15 +399,11 @@ class TelegramBot:
 
         self._job_queue_available = True
 
-        # heartbeat
+        # heartbeat: a chain of one-shot jobs, each firing picks the next
+        # time from market hours (see _schedule_next_heartbeat)
         if self.heartbeat_minutes > 0:
-            job_queue.run_repeating(
-                self._job_heartbeat,
-                interval=self.heartbeat_minutes * 60,
-                first=60,
-                name="heartbeat"
-            )
-            logger.info(f"Heartbeat scheduled every {self.heartbeat_minutes} min")
+            job_queue.run_once(self._job_heartbeat, when=60, name="heartbeat")
+            logger.info("Heartbeat scheduled every %s min", self.heartbeat_minutes)
 
         # token reminder: 07:30 WIB = 00:30 UTC
         job_queue.run_daily(
@@ -182,33 +447,65 @@ class TelegramBot:
     #  Bot lifecycle
     # ------------------------------------------------------------------ #
 
-    def start(self):
-        if self.running:
-            return
-
+    def _prepare(self):
         self._claim_active_instance()
         self._build_app()
         self._schedule_jobs()
         self.running = True
 
+    async def run(self):
+        """Run the bot on the caller's event loop until stop() is called.
+
+        Preferred when the host already has a loop, e.g.
+        ``asyncio.create_task(bot.run())``; notifications from that loop are
+        then scheduled directly instead of hopping threads.
+        """
+        if self.running:
+            return
+        self._prepare()
+        await self._serve()
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        try:
+            await self._run_polling()
+        except Exception as e:
+            self._last_error = str(e)
+            logger.error("Telegram bot error: %s", e, exc_info=True)
+        finally:
+            self.running = False
+            self._loop = None
+            # only now: handlers still awaiting daemon calls during
+            # app.stop()/app.shutdown() need the pool
+            self._executor.shutdown(wait=False)
+
+    def start(self):
+        """Legacy entry point: run the bot on its own loop in a daemon thread."""
+        if self.running:
+            return
+
+        self._prepare()
+
         def run_bot():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
             try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                self._loop = loop
-                loop.run_until_complete(self._run_polling())
-            except Exception as e:
-                self._last_error = str(e)
-                logger.error(f"Telegram bot error: {e}", exc_info=True)
+                loop.run_until_complete(self._serve())
             finally:
-                self.running = False
-                self._loop = None
+                loop.close()
 
         self.thread = threading.Thread(target=run_bot, daemon=True, name="telegram-bot")
         self.thread.start()
         logger.info("Telegram bot started in background thread")
 
     async def _run_polling(self):
+        self._stop_event = asyncio.Event()
+        # one Drive upload at a time so the 16:15 and 00:05 runs (and job
+        # output uploads) can't hit Drive concurrently
+        self._upload_lock = asyncio.Lock()
+        # caps in-flight notification sends so a burst of daemon/job events
+        # queues up instead of opening dozens of HTTP requests at once
+        self._send_sem = asyncio.Semaphore(_MAX_CONCURRENT_SENDS)
         await self.app.initialize()
 
         try:
@@ -219,27 +516,34 @@ class TelegramBot:
                 'first_name': me.first_name,
                 'is_bot': me.is_bot,
             }
-            logger.info(f"Telegram bot validated: @{me.username} (ID: {me.id})")
+            logger.info("Telegram bot validated: @%s (ID: %s)", me.username, me.id)
         except Exception as e:
             self._last_error = f"Token validation failed: {e}"
-            logger.error(f"Telegram bot token validation failed: {e}")
+            logger.error("Telegram bot token validation failed: %s", e)
             raise
 
         await self.app.start()
-        await self.app.updater.start_polling(drop_pending_updates=True)
+        # long-poll: one getUpdates held open up to 30s instead of PTB's 10s
+        await self.app.updater.start_polling(
+            drop_pending_updates=True,
+            timeout=30,
+            poll_interval=0.0,
+            allowed_updates=[Update.MESSAGE, Update.CALLBACK_QUERY],
+        )
 
         try:
-            await self.app.bot.send_message(
+            await self._safe_send(
                 chat_id=self.chat_id,
                 text="*Orderbook Bot Online*\n\nDaemon is running. Use /help for commands.",
                 parse_mode="Markdown"
             )
         except Exception as e:
             self._last_error = f"Failed to send startup message: {e}"
-            logger.error(f"Failed to send startup message: {e}")
+            logger.error("Failed to send startup message: %s", e)
 
-        while self.running:
-            await asyncio.sleep(1)
+        # stop() may have landed before the event existed
+        if self.running:
+            await self._stop_event.wait()
 
         await self.app.updater.stop()
         await self.app.stop()
@@ -247,6 +551,12 @@ class TelegramBot:
 
     def stop(self):
         self.running = False
+        loop = self._loop
+        if loop and self._stop_event:
+            try:
+                loop.call_soon_threadsafe(self._stop_event.set)
+            except RuntimeError:
+                pass  # loop already closed
         logger.info("Telegram bot stopping")
 
     def get_status(self):
@@ -262,16 +572,104 @@ class TelegramBot:
             'last_error': self._last_error,
         }
 
+    async def _cached_status(self):
+        """Daemon status, reused for 0.5s so refresh-button spam and
+        overlapping handlers share one status build."""
+        now = time.monotonic()
+        fetched_at, status = self._status_cache
+        if status is None or now - fetched_at > 0.5:
+            status = await self._call_daemon(self.daemon.get_status)
+            self._status_cache = (now, status)
+        return status
+
+    def _invalidate_status(self):
+        self._status_cache = (0.0, None)
+
     # ---- thread-safe message helper ----
 
+    async def _call_daemon(self, fn, *args, **kwargs):
+        """Run a blocking daemon/uploader call off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def _tg_call(self, fn, *args, **kwargs):
+        """Call a Bot API method, waiting out flood control and retrying
+        transient network errors with jittered backoff.
+
+        Timeouts are not retried: the calls made through here (send/edit)
+        aren't idempotent.
+        """
+        for attempt in range(_SEND_RETRIES + 1):
+            try:
+                return await fn(*args, **kwargs)
+            except RetryAfter as e:
+                if attempt == _SEND_RETRIES:
+                    raise
+                delay = e.retry_after
+                if isinstance(delay, timedelta):
+                    delay = delay.total_seconds()
+                logger.warning("Telegram flood control, retrying in %ss", delay)
+                await asyncio.sleep(delay + 0.1)
+            except BadRequest:
+                raise  # a NetworkError subclass, but retrying won't help
+            except TimedOut:
+                # also a NetworkError, but a send/edit that timed out may
+                # already have gone through; retrying would duplicate it
+                raise
+            except NetworkError as e:
+                if attempt == _SEND_RETRIES:
+                    raise
+                delay = min(2 ** attempt + random.random(), _SEND_BACKOFF_MAX)
+                logger.warning("Telegram network error (%s), retrying in %.1fs", e, delay)
+                await asyncio.sleep(delay)
+
+    async def _safe_send(self, **kwargs):
+        """bot.send_message with flood-control and network retries."""
+        return await self._tg_call(self.app.bot.send_message, **kwargs)
+
+    async def _upload(self, fn, *args):
+        """Run a blocking Drive upload off the loop, one upload at a time."""
+        async with self._upload_lock:
+            return await self._call_daemon(fn, *args)
+
     def _send_async(self, coro):
         """Schedule a coroutine on the bot's event loop from any thread."""
-        if not self.running or not self._loop:
+        loop = self._loop
+        if not self.running or not loop:
+            coro.close()
             return
         try:
-            asyncio.run_coroutine_threadsafe(coro, self._loop)
+            try:
+                on_loop = asyncio.get_running_loop() is loop
+            except RuntimeError:
+                on_loop = False
+            if on_loop:
+                self._spawn_send(coro)
+            else:
+                # fire-and-forget: nobody waits on the result, so skip the
+                # concurrent Future that run_coroutine_threadsafe would build
+                loop.call_soon_threadsafe(self._spawn_send, coro)
         except Exception as e:
-            logger.error(f"Failed to schedule async send: {e}")
+            coro.close()
+            logger.error("Failed to schedule async send: %s", e)
+
+    def _spawn_send(self, coro):
+        """Start a send task on the bot's loop; must run on that loop."""
+        task = asyncio.get_running_loop().create_task(self._bounded_send(coro))
+        # hold a reference so the task isn't garbage-collected mid-send
+        self._pending_sends.add(task)
+        task.add_done_callback(self._send_done)
+
+    async def _bounded_send(self, coro):
+        async with self._send_sem:
+            return await coro
+
+    def _send_done(self, task):
+        self._pending_sends.discard(task)
+        # nobody awaits these tasks, so surface failures here rather than
+        # as "exception was never retrieved" at garbage collection
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Async send failed: %s", task.exception())
 
     async def _async_send_test_message(self):
         if not self.app:
@@ -281,12 +679,12 @@ class TelegramBot:
             await self.app.bot.send_message(
                 chat_id=self.chat_id,
                 text=(
-                    f"*Test Message*\n\n"
-                    f"Bot @{bot_name} is connected!\n"
-                    f"Chat ID: `{self.chat_id}`\n"
+                    f"<b>Test Message</b>\n\n"
+                    f"Bot @{escape(bot_name)} is connected!\n"
+                    f"Chat ID: <code>{escape(str(self.chat_id))}</code>\n"
                     f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
                 ),
-                parse_mode="Markdown"
+                parse_mode="HTML"
             )
             return {'success': True, 'message': f'Test message sent to {self.chat_id}'}
         except Exception as e:
@@ -309,129 +707,93 @@ class TelegramBot:
     # ================================================================== #
 
     async def _cmd_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        chat_id = update.effective_chat.id
         await update.message.reply_text(
-            f"*Orderbook Streaming Bot*\n\n"
-            f"Your Chat ID: `{chat_id}`\n\n"
-            f"Use /help to see available commands.\n"
-            f"Use /status for current daemon status.\n",
-            parse_mode="Markdown"
+            _START_TEMPLATE.format(chat_id=update.effective_chat.id), parse_mode="Markdown"
         )
 
     async def _cmd_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        help_text = (
-            "*Available Commands*\n\n"
-            "*Status & Info*\n"
-            "/status - Daemon & market status\n"
-            "/heartbeat - Connection health check\n"
-            "/recap - Today's trading recap\n\n"
-            "*Ticker Management*\n"
-            "/tickers - View current tickers\n"
-            "/settickers BBCA TLKM - Replace all\n"
-            "/addticker BBCA - Add ticker(s)\n"
-            "/removeticker BBCA - Remove ticker(s)\n\n"
-            "*Stream Control*\n"
-            "/pause - Pause streaming\n"
-            "/resume - Resume streaming\n\n"
-            "*Authentication*\n"
-            "/settoken <token> - Set bearer token\n\n"
-            "*Historical Trade Jobs*\n"
-            "/jobs - List recent jobs\n"
-            "/newjob BBCA,TLKM 2026-01-01 2026-01-31 - Create job\n"
-            "/jobstatus <id> - Job details\n"
-            "/pausejob <id> - Pause a job\n"
-            "/resumejob <id> - Resume a job\n"
-            "/canceljob <id> - Cancel a job\n\n"
-            "*Settings*\n"
-            f"/setheartbeat <min> - Change heartbeat interval (now {self.heartbeat_minutes}m)\n\n"
-            "*Scheduled*\n"
-            f"  Heartbeat: every {self.heartbeat_minutes} min\n"
-            "  Token reminder: 07:30 WIB\n"
-            "  Pre-market: 08:25 WIB\n"
-            "  Daily recap: 16:30 WIB\n"
-            "  GDrive upload: 16:15 WIB + 00:05 WIB\n"
+        await update.message.reply_text(
+            _HELP_TEMPLATE.format(hb=self.heartbeat_minutes), parse_mode="Markdown"
         )
-        await update.message.reply_text(help_text, parse_mode="Markdown")
 
     async def _cmd_status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        status = self.daemon.get_status()
-        state_emojis = {
-            'streaming': '🟢', 'waiting_market': '🟡', 'market_closed': '🌙',
-            'paused': '⏸️', 'error': '🔴', 'no_tickers': '📋',
-        }
-        emoji = state_emojis.get(status['state'], '❓')
+        status = await self._cached_status()
+        emoji = _STATE_EMOJIS.get(status['state'], '❓')
         market = status.get('market', {})
         market_emoji = '🟢' if market.get('is_open') else '🔴'
 
         text = (
-            f"{emoji} *Daemon: {status['state'].replace('_', ' ').title()}*\n"
-            f"{market_emoji} Market: {market.get('reason', 'Unknown')}\n"
+            f"{emoji} <b>Daemon: {status['state'].replace('_', ' ').title()}</b>\n"
+            f"{market_emoji} Market: {escape(market.get('reason', 'Unknown'))}\n"
             f"WIB: {market.get('current_time', '?')[:19].replace('T', ' ')}\n\n"
         )
 
         tickers = status.get('tickers', [])
-        text += f"*Tickers ({len(tickers)}):* {', '.join(tickers) if tickers else 'None'}\n"
+        text += f"<b>Tickers ({len(tickers)}):</b> {self._format_tickers(tickers)}\n"
 
         if status.get('stream'):
             stream = status['stream']
             msg_counts = stream.get('message_counts', {})
             total = sum(msg_counts.values())
             text += (
-                f"\n*Stream*\n"
+                f"\n<b>Stream</b>\n"
                 f"  Messages: {total:,}\n"
                 f"  Reconnects: {stream.get('total_reconnects', 0)}\n"
                 f"  Uptime: {self._format_uptime(stream.get('uptime_seconds', 0))}\n"
             )
             if msg_counts:
-                text += "\n*Per-Ticker:*\n"
-                for ticker, count in sorted(msg_counts.items(), key=lambda x: x[1], reverse=True):
-                    text += f"  `{ticker}`: {count:,}\n"
+                text += "\n<b>Per-Ticker:</b>\n"
+                text += self._format_counts(msg_counts)
 
         if market.get('time_until_next', 0) > 0:
             text += f"\nNext open in: {self._format_uptime(market['time_until_next'])}"
 
-        keyboard = []
         if status['state'] == 'streaming':
-            keyboard.append([InlineKeyboardButton("⏸ Pause", callback_data="pause")])
+            keyboard = _STATUS_KEYBOARD_STREAMING
         elif status.get('paused'):
-            keyboard.append([InlineKeyboardButton("▶️ Resume", callback_data="resume")])
-        keyboard.append([InlineKeyboardButton("🔄 Refresh", callback_data="refresh_status")])
+            keyboard = _STATUS_KEYBOARD_PAUSED
+        else:
+            keyboard = _STATUS_KEYBOARD
 
-        await update.message.reply_text(
-            text, parse_mode="Markdown",
-            reply_markup=InlineKeyboardMarkup(keyboard) if keyboard else None
-        )
+        # per-ticker lines can push a busy day past Telegram's 4096-char cap;
+        # send in order, with the keyboard under the last piece
+        chunks = _chunks(text.splitlines(keepends=True))
+        for chunk in chunks[:-1]:
+            await update.message.reply_text(chunk, parse_mode="HTML")
+        await update.message.reply_text(chunks[-1], parse_mode="HTML", reply_markup=keyboard)
 
     async def _cmd_tickers(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        status = self.daemon.get_status()
+        status = await self._cached_status()
         tickers = status.get('tickers', [])
         if not tickers:
             await update.message.reply_text("No tickers configured.\n\nUse /settickers BBCA TLKM to set tickers.")
             return
-        text = f"*Active Tickers ({len(tickers)})*\n\n"
-        for t in tickers:
-            text += f"  `{t}`\n"
-        keyboard = [[InlineKeyboardButton("Replace All", callback_data="prompt_set_tickers")]]
-        await update.message.reply_text(text, parse_mode="Markdown",
-                                        reply_markup=InlineKeyboardMarkup(keyboard))
+        text = f"<b>Active Tickers ({len(tickers)})</b>\n\n"
+        text += ''.join(f"  <code>{escape(t)}</code>\n" for t in tickers)
+        await update.message.reply_text(text, parse_mode="HTML",
+                                        reply_markup=_REPLACE_TICKERS_KEYBOARD)
 
     async def _cmd_set_tickers(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not context.args:
             await update.message.reply_text("Usage: /settickers BBCA TLKM BMRI ...")
             return
-        result = self.daemon.set_tickers(context.args)
+        result = await self._call_daemon(self.daemon.set_tickers, context.args)
+        self._invalidate_status()
         tickers = result.get('tickers', [])
         old = result.get('old_tickers', [])
         await update.message.reply_text(
-            f"*Tickers Updated*\n\nOld: {', '.join(old) if old else 'None'}\nNew: {', '.join(tickers)}\n",
-            parse_mode="Markdown"
+            f"<b>Tickers Updated</b>\n\n"
+            f"Old: {self._format_tickers(old)}\n"
+            f"New: {self._format_tickers(tickers)}\n",
+            parse_mode="HTML"
         )
 
     async def _cmd_add_ticker(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not context.args:
             await update.message.reply_text("Usage: /addticker BBCA TLKM ...")
             return
-        result = self.daemon.add_tickers(context.args)
+        result = await self._call_daemon(self.daemon.add_tickers, context.args)
+        self._invalidate_status()
         added = result.get('added', [])
         all_tickers = result.get('tickers', [])
         if added:
@@ -443,7 +805,8 @@ class TelegramBot:
         if not context.args:
             await update.message.reply_text("Usage: /removeticker BBCA TLKM ...")
             return
-        result = self.daemon.remove_tickers(context.args)
+        result = await self._call_daemon(self.daemon.remove_tickers, context.args)
+        self._invalidate_status()
         removed = result.get('removed', [])
         remaining = result.get('tickers', [])
         if removed:
@@ -453,14 +816,16 @@ class TelegramBot:
             await update.message.reply_text("None of the specified tickers were found.")
 
     async def _cmd_pause(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        result = self.daemon.pause()
+        result = await self._call_daemon(self.daemon.pause)
+        self._invalidate_status()
         await update.message.reply_text(
             f"⏸ *Daemon Paused*\n\nState: {result.get('state', 'unknown')}",
             parse_mode="Markdown"
         )
 
     async def _cmd_resume(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        result = self.daemon.resume()
+        result = await self._call_daemon(self.daemon.resume)
+        self._invalidate_status()
         await update.message.reply_text(
             f"▶️ *Daemon Resumed*\n\nState: {result.get('state', 'unknown')}",
             parse_mode="Markdown"
@@ -477,34 +842,36 @@ class TelegramBot:
             return
 
         bearer_token = context.args[0]
-        result = self.daemon.set_token_and_reconnect(bearer_token)
+        await update.message.reply_text("Token received, reconnecting...")
+        result = await self._call_daemon(self.daemon.set_token_and_reconnect, bearer_token)
+        self._invalidate_status()
 
         if result.get('success'):
             await update.message.reply_text(
-                f"*Token Updated*\n\n{result.get('message', '')}",
-                parse_mode="Markdown"
+                f"<b>Token Updated</b>\n\n{escape(str(result.get('message', '')))}",
+                parse_mode="HTML"
             )
         else:
             await update.message.reply_text(
-                f"*Error*\n\n{result.get('error', 'Unknown error')}",
-                parse_mode="Markdown"
+                f"<b>Error</b>\n\n{escape(str(result.get('error', 'Unknown error')))}",
+                parse_mode="HTML"
             )
 
     async def _cmd_recap(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        recap = self.daemon.get_daily_recap()
-        text = f"*Daily Recap — {recap.get('date', 'Today')}*\n\n"
+        recap = await self._call_daemon(self.daemon.get_daily_recap)
+        text = f"<b>Daily Recap — {recap.get('date', 'Today')}</b>\n\n"
         tickers = recap.get('tickers', [])
-        text += f"Tickers: {', '.join(tickers) if tickers else 'None'}\n"
+        text += f"Tickers: {self._format_tickers(tickers)}\n"
         text += f"Total Messages: {recap.get('total_messages', 0):,}\n"
         text += f"Reconnects: {recap.get('total_reconnects', 0)}\n\n"
         msg_counts = recap.get('message_counts', {})
         if msg_counts:
-            text += "*Per-Ticker:*\n"
-            for ticker, count in sorted(msg_counts.items(), key=lambda x: x[1], reverse=True):
-                text += f"  `{ticker}`: {count:,}\n"
+            text += "<b>Per-Ticker:</b>\n"
+            text += self._format_counts(msg_counts)
         if recap.get('next_open'):
             text += f"\nNext session: {recap['next_open'][:19].replace('T', ' ')} WIB"
-        await update.message.reply_text(text, parse_mode="Markdown")
+        for chunk in _chunks(text.splitlines(keepends=True)):
+            await update.message.reply_text(chunk, parse_mode="HTML")
 
     async def _cmd_heartbeat(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         await self._send_heartbeat(update.effective_chat.id)
@@ -533,16 +900,17 @@ class TelegramBot:
         # reschedule if job queue is available
         jq = self.app.job_queue
         if jq:
-            # remove old heartbeat job
-            for job in jq.get_jobs_by_name("heartbeat"):
-                job.schedule_removal()
-            # schedule with new interval
-            jq.run_repeating(
-                self._job_heartbeat,
-                interval=minutes * 60,
-                first=60,
-                name="heartbeat"
-            )
+            jobs = jq.get_jobs_by_name("heartbeat")
+            if jobs:
+                # move the pending beat in place so there's no gap between
+                # removing it and adding a new one; it reschedules itself
+                # with the new interval after firing
+                jobs[0].job.reschedule(
+                    trigger='date',
+                    run_date=datetime.now(timezone.utc) + timedelta(seconds=60),
+                )
+            else:
+                jq.run_once(self._job_heartbeat, when=60, name="heartbeat")
 
         await update.message.reply_text(
             f"*Heartbeat Updated*\n\n{old} min -> {minutes} min",
@@ -559,30 +927,37 @@ class TelegramBot:
             await update.message.reply_text("Job manager not available.")
             return
 
-        jobs_list = self.job_manager.list_jobs()
+        # Job objects rather than list_jobs() dicts: no per-task serialization,
+        # and progress comes from each job's cached counters
+        jobs_list = list(self.job_manager.jobs.values())
         if not jobs_list:
             await update.message.reply_text("No jobs found.\n\nCreate one with /newjob")
             return
 
-        status_icons = {
-            'QUEUED': '🔵', 'RUNNING': '🟢', 'PAUSED': '🟡',
-            'COMPLETED': '✅', 'FAILED': '🔴',
-        }
+        lines = [f"<b>Recent Jobs ({len(jobs_list)})</b>\n\n"]
+        for job in jobs_list[:10]:
+            status = job.status.value
+            icon = _JOB_STATUS_ICONS.get(status, '❓')
+            tickers_str = self._format_tickers(job.tickers[:3])
+            if len(job.tickers) > 3:
+                tickers_str += f" +{len(job.tickers) - 3}"
+            done, total, _ = job.quick_progress()
+            lines.append(f"{icon} <code>{job.short_id}</code> {status} — {tickers_str} ({done}/{total})\n")
 
-        text = f"*Recent Jobs ({len(jobs_list)})*\n\n"
-        for j in jobs_list[:10]:
-            icon = status_icons.get(j['status'], '❓')
-            short_id = j['job_id'][:8]
-            tickers_str = ', '.join(j.get('tickers', [])[:3])
-            if len(j.get('tickers', [])) > 3:
-                tickers_str += f" +{len(j['tickers']) - 3}"
-            progress = j.get('tasks', [])
-            total = len(progress)
-            done = sum(1 for t in progress if t.get('status') in ('COMPLETED', 'SKIPPED'))
-            text += f"{icon} `{short_id}` {j['status']} — {tickers_str} ({done}/{total})\n"
-
-        text += "\nUse /jobstatus <id> for details"
-        await update.message.reply_text(text, parse_mode="Markdown")
+        lines.append("\nUse /jobstatus &lt;id&gt; for details")
+        await update.message.reply_text(''.join(lines), parse_mode="HTML")
+
+    @staticmethod
+    def _valid_date(value: str) -> bool:
+        """Check a YYYY-MM-DD string without going through strptime."""
+        m = _DATE_RE.match(value)
+        if not m:
+            return False
+        try:
+            date(*map(int, m.groups()))
+        except ValueError:
+            return False
+        return True
 
     async def _cmd_new_job(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Create a historical trade job.
@@ -594,13 +969,7 @@ class TelegramBot:
             return
 
         if len(context.args) < 3:
-            await update.message.reply_text(
-                "*Create Historical Trade Job*\n\n"
-                "Usage: `/newjob TICKERS FROM TO [delay] [limit]`\n\n"
-                "Example:\n`/newjob BBCA,TLKM 2026-01-01 2026-01-31`\n"
-                "`/newjob BBRI 2026-02-01 2026-02-15 2 100`",
-                parse_mode="Markdown"
-            )
+            await update.message.reply_text(_NEW_JOB_USAGE, parse_mode="Markdown")
             return
 
         tickers = [t.strip().upper() for t in context.args[0].split(',') if t.strip()]
@@ -609,14 +978,12 @@ class TelegramBot:
         delay = float(context.args[3]) if len(context.args) > 3 else 3.0
         limit = int(context.args[4]) if len(context.args) > 4 else 50
 
-        try:
-            datetime.strptime(from_date, '%Y-%m-%d')
-            datetime.strptime(until_date, '%Y-%m-%d')
-        except ValueError:
+        if not (self._valid_date(from_date) and self._valid_date(until_date)):
             await update.message.reply_text("Invalid date format. Use YYYY-MM-DD.")
             return
 
-        job_id = self.job_manager.create_job(
+        job_id = await self._call_daemon(
+            self.job_manager.create_job,
             tickers=tickers,
             from_date=from_date,
             until_date=until_date,
@@ -626,15 +993,16 @@ class TelegramBot:
 
         job = self.job_manager.get_job(job_id)
         total_tasks = len(job.tasks) if job else '?'
+        short_id = job.short_id if job else job_id[:8]
 
         await update.message.reply_text(
-            f"*Job Created*\n\n"
-            f"ID: `{job_id[:8]}`\n"
-            f"Tickers: {', '.join(tickers)}\n"
+            f"<b>Job Created</b>\n\n"
+            f"ID: <code>{short_id}</code>\n"
+            f"Tickers: {self._format_tickers(tickers)}\n"
             f"Range: {from_date} to {until_date}\n"
             f"Tasks: {total_tasks}\n"
             f"Delay: {delay}s | Limit: {limit}",
-            parse_mode="Markdown"
+            parse_mode="HTML"
         )
 
     async def _cmd_job_status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -649,16 +1017,18 @@ class TelegramBot:
         partial_id = context.args[0].lower()
         job = self._find_job_by_partial_id(partial_id)
         if not job:
-            await update.message.reply_text(f"No job found matching `{partial_id}`")
+            await update.message.reply_text(
+                f"No job found matching <code>{escape(partial_id)}</code>", parse_mode="HTML"
+            )
             return
 
         progress = job.get_progress()
         text = (
-            f"*Job {job.job_id[:8]}*\n\n"
+            f"<b>Job {job.short_id}</b>\n\n"
             f"Status: {job.status.value}\n"
-            f"Tickers: {', '.join(job.tickers)}\n"
+            f"Tickers: {self._format_tickers(job.tickers)}\n"
             f"Range: {job.from_date} to {job.until_date}\n\n"
-            f"*Progress*\n"
+            f"<b>Progress</b>\n"
             f"  Total: {progress['total']}\n"
             f"  Completed: {progress['completed']}\n"
             f"  Failed: {progress['failed']}\n"
@@ -666,15 +1036,14 @@ class TelegramBot:
             f"  Pending: {progress['pending']}\n"
             f"  Percent: {progress['percentage']}%\n"
         )
-        records = sum(t.records_fetched for t in job.tasks)
-        text += f"\nRecords fetched: {records:,}"
+        text += f"\nRecords fetched: {job.quick_progress()[2]:,}"
 
         if job.started_at:
             text += f"\nStarted: {job.started_at[:19]}"
         if job.completed_at:
             text += f"\nCompleted: {job.completed_at[:19]}"
 
-        await update.message.reply_text(text, parse_mode="Markdown")
+        await update.message.reply_text(text, parse_mode="HTML")
 
     async def _cmd_pause_job(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not self.job_manager or not context.args:
@@ -685,7 +1054,7 @@ class TelegramBot:
             await update.message.reply_text("Job not found.")
             return
         self.job_manager.pause_job(job.job_id)
-        await update.message.reply_text(f"⏸ Job `{job.job_id[:8]}` paused.", parse_mode="Markdown")
+        await update.message.reply_text(f"⏸ Job `{job.short_id}` paused.", parse_mode="Markdown")
 
     async def _cmd_resume_job(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not self.job_manager or not context.args:
@@ -696,7 +1065,7 @@ class TelegramBot:
             await update.message.reply_text("Job not found.")
             return
         self.job_manager.resume_job(job.job_id)
-        await update.message.reply_text(f"▶️ Job `{job.job_id[:8]}` resumed.", parse_mode="Markdown")
+        await update.message.reply_text(f"▶️ Job `{job.short_id}` resumed.", parse_mode="Markdown")
 
     async def _cmd_cancel_job(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not self.job_manager or not context.args:
@@ -707,16 +1076,13 @@ class TelegramBot:
             await update.message.reply_text("Job not found.")
             return
         self.job_manager.cancel_job(job.job_id)
-        await update.message.reply_text(f"Job `{job.job_id[:8]}` cancelled.", parse_mode="Markdown")
+        await update.message.reply_text(f"Job `{job.short_id}` cancelled.", parse_mode="Markdown")
 
     def _find_job_by_partial_id(self, partial_id: str):
         """Look up a job by prefix match on its UUID."""
         if not self.job_manager:
             return None
-        for jid, job in self.job_manager.jobs.items():
-            if jid.lower().startswith(partial_id):
-                return job
-        return None
+        return self.job_manager.find_job(partial_id)
 
     # ================================================================== #
     #  INLINE KEYBOARD HANDLER
@@ -727,32 +1093,36 @@ class TelegramBot:
         await query.answer()
 
         if query.data == "pause":
-            result = self.daemon.pause()
-            await query.edit_message_text(f"⏸ Daemon paused.\nState: {result.get('state', 'unknown')}")
+            result = await self._call_daemon(self.daemon.pause)
+            self._invalidate_status()
+            await self._tg_call(
+                query.edit_message_text, f"⏸ Daemon paused.\nState: {result.get('state', 'unknown')}"
+            )
         elif query.data == "resume":
-            result = self.daemon.resume()
-            await query.edit_message_text(f"▶️ Daemon resumed.\nState: {result.get('state', 'unknown')}")
+            result = await self._call_daemon(self.daemon.resume)
+            self._invalidate_status()
+            await self._tg_call(
+                query.edit_message_text, f"▶️ Daemon resumed.\nState: {result.get('state', 'unknown')}"
+            )
         elif query.data == "refresh_status":
-            status = self.daemon.get_status()
-            state_emojis = {
-                'streaming': '🟢', 'waiting_market': '🟡', 'market_closed': '🌙',
-                'paused': '⏸️', 'error': '🔴', 'no_tickers': '📋',
-            }
-            emoji = state_emojis.get(status['state'], '❓')
+            status = await self._cached_status()
+            emoji = _STATE_EMOJIS.get(status['state'], '❓')
             text = f"{emoji} State: {status['state'].replace('_', ' ').title()}\n"
             if status.get('stream'):
                 mc = status['stream'].get('message_counts', {})
                 text += f"Messages: {sum(mc.values()):,}\n"
                 text += f"Reconnects: {status['stream'].get('total_reconnects', 0)}\n"
             text += f"Tickers: {', '.join(status.get('tickers', []))}"
-            await query.edit_message_text(text)
+            await self._tg_call(query.edit_message_text, text)
         elif query.data == "prompt_set_tickers":
-            await query.edit_message_text(
+            await self._tg_call(
+                query.edit_message_text,
                 "Send tickers with /settickers command:\n`/settickers BBCA TLKM BMRI`",
                 parse_mode="Markdown"
             )
         elif query.data == "prompt_set_token":
-            await query.edit_message_text(
+            await self._tg_call(
+                query.edit_message_text,
                 "Send your bearer token:\n`/settoken <your_token>`\n\n"
                 "Delete the message after sending.",
                 parse_mode="Markdown"
@@ -765,64 +1135,81 @@ class TelegramBot:
     async def _job_heartbeat(self, context: ContextTypes.DEFAULT_TYPE):
         """Only send automatic heartbeats when the market is open or
         opening within the next hour. Silent otherwise."""
-        if not self._is_active_instance():
-            return
+        status = None
         try:
-            status = self.daemon.get_status()
+            if not self._is_active_instance():
+                return
+            status = await self._cached_status()
             market = status.get('market', {})
             is_open = market.get('is_open', False)
             secs_until_next = market.get('time_until_next', 99999)
 
             # fire if market is currently open, or next open is < 1 hour away
             if is_open or secs_until_next <= 3600:
-                await self._send_heartbeat(self.chat_id)
+                await self._send_heartbeat(self.chat_id, status)
         except Exception as e:
-            logger.error(f"Heartbeat job error: {e}")
-
-    async def _send_heartbeat(self, chat_id):
-        status = self.daemon.get_status()
+            logger.error("Heartbeat job error: %s", e)
+        finally:
+            self._schedule_next_heartbeat(context.job_queue, status)
+
+    def _schedule_next_heartbeat(self, job_queue, status=None):
+        """Queue the next heartbeat: one interval ahead while the market is
+        open or about to open, otherwise sleep until an hour before the next
+        open instead of waking every interval just to stay silent."""
+        interval = self.heartbeat_minutes * 60
+        delay = interval
+        market = (status or {}).get('market', {})
+        secs_until_next = market.get('time_until_next')
+        if not market.get('is_open') and secs_until_next:
+            delay = max(interval, secs_until_next - 3600)
+
+        # keep a single chain even if /setheartbeat queued one meanwhile
+        for job in job_queue.get_jobs_by_name("heartbeat"):
+            job.schedule_removal()
+        job_queue.run_once(self._job_heartbeat, when=delay, name="heartbeat")
+
+    async def _send_heartbeat(self, chat_id, status=None):
+        # callers that already hold a status snapshot pass it through
+        if status is None:
+            status = await self._cached_status()
         state = status['state']
-        state_emojis = {
-            'streaming': '🟢', 'waiting_market': '🟡', 'market_closed': '🌙',
-            'paused': '⏸️', 'error': '🔴', 'no_tickers': '📋',
-        }
-        emoji = state_emojis.get(state, '❓')
-        text = f"*Heartbeat*\n\n{emoji} State: {state.replace('_', ' ').title()}\n"
-        tickers = status.get('tickers', [])
-        text += f"Tickers: {', '.join(tickers) if tickers else 'None'}\n"
+        emoji = _STATE_EMOJIS.get(state, '❓')
+        parts = [
+            f"<b>Heartbeat</b>\n\n{emoji} State: {state.replace('_', ' ').title()}\n",
+            f"Tickers: {self._format_tickers(status.get('tickers', []))}\n",
+        ]
 
         if status.get('stream'):
             stream = status['stream']
             mc = stream.get('message_counts', {})
-            text += (
-                f"\nConnection: {stream.get('connection_status', 'unknown')}\n"
+            parts.append(
+                f"\nConnection: {escape(str(stream.get('connection_status', 'unknown')))}\n"
                 f"Messages: {sum(mc.values()):,}\n"
                 f"Reconnects: {stream.get('total_reconnects', 0)}\n"
                 f"Uptime: {self._format_uptime(stream.get('uptime_seconds', 0))}\n"
             )
             if mc:
-                text += "\n*Lines per ticker:*\n"
-                for ticker, count in sorted(mc.items(), key=lambda x: x[1], reverse=True):
-                    text += f"  `{ticker}`: {count:,}\n"
+                parts.append("\n<b>Lines per ticker:</b>\n")
+                parts.append(self._format_counts(mc))
 
-        await self.app.bot.send_message(chat_id=chat_id, text=text, parse_mode="Markdown")
+        await self._safe_send(chat_id=chat_id, text=''.join(parts), parse_mode="HTML")
 
     async def _job_token_reminder(self, context: ContextTypes.DEFAULT_TYPE):
         """Daily 07:30 WIB reminder to set the bearer token (trade days only)."""
         if not self._is_active_instance():
             return
         try:
-            now = datetime.now()
+            now = datetime.now(_WIB)
             if now.weekday() >= 5:
                 return
 
             # skip if the daemon already has a valid token
-            token_status = self.daemon.token_manager.get_status()
+            token_status = await self._call_daemon(self.daemon.token_manager.get_status)
             if token_status.get('valid'):
                 logger.info("Token still valid, skipping reminder")
                 return
 
-            await self.app.bot.send_message(
+            await self._safe_send(
                 chat_id=self.chat_id,
                 text=(
                     "*Token Reminder*\n\n"
@@ -834,61 +1221,65 @@ class TelegramBot:
                 parse_mode="Markdown"
             )
         except Exception as e:
-            logger.error(f"Token reminder error: {e}")
+            logger.error("Token reminder error: %s", e)
 
     async def _send_daily_recap(self):
         try:
-            today = datetime.now().date()
+            today = datetime.now(_WIB).date()
             if self._recap_sent_date == today:
                 return
 
-            recap = self.daemon.get_daily_recap()
-            text = f"*Daily Market Recap — {recap.get('date', str(today))}*\n\n"
-            tickers = recap.get('tickers', [])
-            text += f"Active Tickers: {', '.join(tickers) if tickers else 'None'}\n"
-            text += f"Total Messages: {recap.get('total_messages', 0):,}\n"
-            text += f"Reconnects: {recap.get('total_reconnects', 0)}\n\n"
+            recap = await self._call_daemon(self.daemon.get_daily_recap)
+            # weekends, holidays, or no watchlist: nothing worth a notification
+            if recap.get('total_messages', 0) == 0 and not recap.get('tickers'):
+                self._recap_sent_date = today
+                logger.info("Skipping empty daily recap")
+                return
+
+            parts = [
+                f"<b>Daily Market Recap — {recap.get('date', str(today))}</b>\n\n",
+                f"Active Tickers: {self._format_tickers(recap.get('tickers', []))}\n",
+                f"Total Messages: {recap.get('total_messages', 0):,}\n",
+                f"Reconnects: {recap.get('total_reconnects', 0)}\n\n",
+            ]
 
             msg_counts = recap.get('message_counts', {})
             if msg_counts:
-                text += "*Volume per Ticker:*\n"
-                for ticker, count in sorted(msg_counts.items(), key=lambda x: x[1], reverse=True):
-                    text += f"  `{ticker}`: {count:,}\n"
+                parts.append("<b>Volume per Ticker:</b>\n")
+                parts.append(self._format_counts(msg_counts, top=_RECAP_TOP_TICKERS))
 
             if recap.get('next_open'):
-                text += f"\nNext session: {recap['next_open'][:19].replace('T', ' ')} WIB"
+                parts.append(f"\nNext session: {recap['next_open'][:19].replace('T', ' ')} WIB")
 
-            text += "\n\n*Bot entering night mode* (heartbeats paused until 08:30 WIB)"
+            parts.append("\n\n<b>Bot entering night mode</b> (heartbeats paused until 08:30 WIB)")
 
-            await self.app.bot.send_message(
-                chat_id=self.chat_id, text=text, parse_mode="Markdown"
+            await self._safe_send(
+                chat_id=self.chat_id, text=''.join(parts), parse_mode="HTML"
             )
             self._recap_sent_date = today
             logger.info("Daily recap sent")
         except Exception as e:
-            logger.error(f"Failed to send daily recap: {e}", exc_info=True)
+            logger.error("Failed to send daily recap: %s", e, exc_info=True)
 
     async def _job_pre_market(self, context: ContextTypes.DEFAULT_TYPE):
         if not self._is_active_instance():
             return
         try:
-            status = self.daemon.get_status()
+            status = await self._cached_status()
             tickers = status.get('tickers', [])
-            text = "*Pre-Market Update*\n\nMarket opens in ~30 minutes!\n\n"
+            text = "<b>Pre-Market Update</b>\n\nMarket opens in ~30 minutes!\n\n"
             if tickers:
-                text += "*Streaming tickers:*\n"
-                for t in tickers:
-                    text += f"  `{t}`\n"
+                text += "<b>Streaming tickers:</b>\n"
+                text += ''.join(f"  <code>{escape(t)}</code>\n" for t in tickers)
                 text += f"\nTotal: {len(tickers)} tickers"
             else:
                 text += "No tickers configured! Add tickers with /settickers"
-            keyboard = [[InlineKeyboardButton("View Tickers", callback_data="refresh_status")]]
-            await self.app.bot.send_message(
-                chat_id=self.chat_id, text=text, parse_mode="Markdown",
-                reply_markup=InlineKeyboardMarkup(keyboard)
+            await self._safe_send(
+                chat_id=self.chat_id, text=text, parse_mode="HTML",
+                reply_markup=_VIEW_TICKERS_KEYBOARD
             )
         except Exception as e:
-            logger.error(f"Pre-market job error: {e}")
+            logger.error("Pre-market job error: %s", e)
 
     async def _job_daily_recap(self, context: ContextTypes.DEFAULT_TYPE):
         if not self._is_active_instance():
@@ -901,14 +1292,16 @@ class TelegramBot:
         """16:15 WIB — upload today's orderbook files to Drive."""
         if not self._is_active_instance():
             return
-        today = datetime.now().strftime('%Y-%m-%d')
+        today = datetime.now(_WIB).strftime('%Y-%m-%d')
         await self._run_gdrive_upload(today)
 
     async def _job_gdrive_midnight(self, context: ContextTypes.DEFAULT_TYPE):
         """00:05 WIB — catch-all re-upload for yesterday's files."""
         if not self._is_active_instance():
             return
-        yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+        # runs at 17:05 UTC, so the host's local date may still be the day
+        # before in WIB; take "yesterday" from the WIB calendar
+        yesterday = (datetime.now(_WIB) - timedelta(days=1)).strftime('%Y-%m-%d')
         await self._run_gdrive_upload(yesterday)
 
     async def _run_gdrive_upload(self, date_str: str):
@@ -918,7 +1311,7 @@ class TelegramBot:
             return
 
         try:
-            result = self.gdrive_uploader.upload_orderbook_day(date_str, self.orderbook_dir)
+            result = await self._upload(self.gdrive_uploader.upload_orderbook_day, date_str, self.orderbook_dir)
             uploaded = result.get('uploaded', 0)
             failed = result.get('failed', 0)
             skipped = result.get('skipped', 0)
@@ -926,36 +1319,36 @@ class TelegramBot:
             size_mb = total_bytes / (1024 * 1024)
 
             if uploaded == 0 and failed == 0 and skipped == 0:
-                logger.info(f"GDrive: no files to upload for {date_str}")
+                logger.info("GDrive: no files to upload for %s", date_str)
                 return
 
             if result['success']:
                 text = (
-                    f"*Upload Complete*\n\n"
+                    f"<b>Upload Complete</b>\n\n"
                     f"Date: {date_str}\n"
                     f"Uploaded: {uploaded}  |  Skipped: {skipped}  |  Failed: {failed}\n"
                     f"Size: {size_mb:.1f} MB\n"
                 )
             else:
                 text = (
-                    f"*Upload Partial Failure*\n\n"
+                    f"<b>Upload Partial Failure</b>\n\n"
                     f"Date: {date_str}\n"
                     f"Uploaded: {uploaded}  |  Failed: {failed}\n"
                 )
                 for r in result.get('results', []):
                     if not r.get('success') and not r.get('skipped'):
-                        text += f"  {r['file']}: {r.get('error', '?')}\n"
+                        text += f"  {escape(str(r['file']))}: {escape(str(r.get('error', '?')))}\n"
 
-            await self.app.bot.send_message(
-                chat_id=self.chat_id, text=text, parse_mode="Markdown"
+            await self._safe_send(
+                chat_id=self.chat_id, text=text, parse_mode="HTML"
             )
         except Exception as e:
-            logger.error(f"GDrive upload job error for {date_str}: {e}", exc_info=True)
+            logger.error("GDrive upload job error for %s: %s", date_str, e, exc_info=True)
             try:
-                await self.app.bot.send_message(
+                await self._safe_send(
                     chat_id=self.chat_id,
-                    text=f"*Upload Failed*\n\nDate: {date_str}\nError: {e}",
-                    parse_mode="Markdown"
+                    text=f"<b>Upload Failed</b>\n\nDate: {date_str}\nError: {escape(str(e))}",
+                    parse_mode="HTML"
                 )
             except Exception:
                 pass
@@ -969,25 +1362,29 @@ class TelegramBot:
             return
         if not self._is_active_instance():
             return
+        now = time.monotonic()
+        last_count, last_ts = self._last_reconnect_alert
+        if consecutive_count == last_count and now - last_ts < _RECONNECT_ALERT_DEDUPE_SECS:
+            return
+        self._last_reconnect_alert = (consecutive_count, now)
 
         async def send_alert():
             try:
-                status = self.daemon.get_status()
+                status = await self._cached_status()
                 text = (
-                    f"*Reconnection Alert*\n\n"
+                    f"<b>Reconnection Alert</b>\n\n"
                     f"Consecutive reconnects: {consecutive_count}\n"
                     f"State: {status['state']}\n"
                 )
                 if status.get('stream') and status['stream'].get('last_error'):
-                    text += f"Last error: {status['stream']['last_error']}\n"
+                    text += f"Last error: {escape(str(status['stream']['last_error']))}\n"
                 text += "\nThe daemon will keep trying to reconnect automatically."
-                keyboard = [[InlineKeyboardButton("Check Status", callback_data="refresh_status")]]
-                await self.app.bot.send_message(
-                    chat_id=self.chat_id, text=text, parse_mode="Markdown",
-                    reply_markup=InlineKeyboardMarkup(keyboard)
+                await self._safe_send(
+                    chat_id=self.chat_id, text=text, parse_mode="HTML",
+                    reply_markup=_CHECK_STATUS_KEYBOARD
                 )
             except Exception as e:
-                logger.error(f"Failed to send reconnect alert: {e}")
+                logger.error("Failed to send reconnect alert: %s", e)
 
         self._send_async(send_alert())
 
@@ -999,25 +1396,28 @@ class TelegramBot:
             return
         if not self._is_active_instance():
             return
+        # the stream can flap error <-> streaming during a network blip;
+        # report each distinct transition at most once per window
+        key = (old_state.value, new_state.value)
+        now = time.monotonic()
+        if now - self._state_alert_times.get(key, float('-inf')) < _STATE_ALERT_DEDUPE_SECS:
+            return
+        self._state_alert_times[key] = now
 
         async def send_notification():
             try:
-                state_emojis = {
-                    'streaming': '🟢', 'waiting_market': '🟡', 'market_closed': '🌙',
-                    'paused': '⏸️', 'error': '🔴', 'no_tickers': '📋',
-                }
-                emoji = state_emojis.get(new_state.value, '❓')
-                old_emoji = state_emojis.get(old_state.value, '❓')
+                emoji = _STATE_EMOJIS.get(new_state.value, '❓')
+                old_emoji = _STATE_EMOJIS.get(old_state.value, '❓')
                 text = (
                     f"*State Changed*\n\n"
                     f"{old_emoji} {old_state.value.replace('_', ' ').title()}"
                     f" -> {emoji} {new_state.value.replace('_', ' ').title()}"
                 )
-                await self.app.bot.send_message(
+                await self._safe_send(
                     chat_id=self.chat_id, text=text, parse_mode="Markdown"
                 )
             except Exception as e:
-                logger.error(f"Failed to send state change notification: {e}")
+                logger.error("Failed to send state change notification: %s", e)
 
         self._send_async(send_notification())
 
@@ -1032,20 +1432,34 @@ class TelegramBot:
         if not self._is_active_instance():
             return
 
+        if event == 'job_progress':
+            # coalesced into one edited message per job, see _queue_progress
+            try:
+                self._loop.call_soon_threadsafe(self._queue_progress, data)
+            except RuntimeError:
+                pass  # loop already closed
+            return
+
         async def _send():
             try:
+                if event in ('job_completed', 'job_failed', 'job_cancelled', 'job_paused'):
+                    # forget the job, push out its pending progress and wait for
+                    # any in-flight progress send so it can't land after this one
+                    job_id = data.get('job_id')
+                    entry = self._progress_state.pop(job_id, None)
+                    if entry is not None:
+                        await self._send_progress(job_id, entry)
+
                 text = self._format_job_event(event, data)
                 if not text:
                     return
 
                 keyboard = None
                 if event == 'job_paused' and data.get('reason') == 'Token expired':
-                    keyboard = InlineKeyboardMarkup([
-                        [InlineKeyboardButton("Set Token", callback_data="prompt_set_token")]
-                    ])
+                    keyboard = _SET_TOKEN_KEYBOARD
 
-                await self.app.bot.send_message(
-                    chat_id=self.chat_id, text=text, parse_mode="Markdown",
+                await self._safe_send(
+                    chat_id=self.chat_id, text=text, parse_mode="HTML",
                     reply_markup=keyboard
                 )
 
@@ -1054,105 +1468,154 @@ class TelegramBot:
                     await self._upload_job_output(data)
 
             except Exception as e:
-                logger.error(f"Failed to send job event notification: {e}")
+                logger.error("Failed to send job event notification: %s", e)
 
         self._send_async(_send())
 
+    def _queue_progress(self, data: dict):
+        """Keep the newest progress payload per job and arm one flush timer."""
+        entry = self._progress_state.get(data.get('job_id'))
+        if entry is None:
+            entry = self._progress_state[data.get('job_id')] = {
+                'data': None, 'message_id': None, 'lock': asyncio.Lock()
+            }
+        entry['data'] = data
+        if self._progress_flush is None:
+            self._progress_flush = self._loop.call_later(_PROGRESS_FLUSH_DELAY, self._start_progress_flush)
+
+    def _start_progress_flush(self):
+        self._progress_flush = None
+        self._spawn_send(self._flush_progress())
+
+    async def _flush_progress(self):
+        """Send pending progress snapshots, editing each job's earlier message."""
+        for job_id, entry in list(self._progress_state.items()):
+            await self._send_progress(job_id, entry)
+
+    async def _send_progress(self, job_id, entry: dict):
+        """Send one job's pending snapshot; the entry lock keeps its sends in order."""
+        async with entry['lock']:
+            data = entry['data']
+            if data is None:
+                return
+            entry['data'] = None
+            try:
+                text = self._format_job_event('job_progress', data)
+                if entry['message_id'] is None:
+                    message = await self._safe_send(
+                        chat_id=self.chat_id, text=text, parse_mode="HTML"
+                    )
+                    entry['message_id'] = message.message_id
+                else:
+                    await self._tg_call(
+                        self.app.bot.edit_message_text,
+                        chat_id=self.chat_id, message_id=entry['message_id'],
+                        text=text, parse_mode="HTML"
+                    )
+            except Exception as e:
+                logger.error("Failed to send job progress for %s: %s", job_id, e)
+
     def _format_job_event(self, event: str, data: dict) -> str:
-        short_id = data.get('job_id', '?')[:8]
-        tickers = ', '.join(data.get('tickers', []))
-
-        if event == 'job_started':
-            return (
-                f"*Job Started*\n\n"
-                f"ID: `{short_id}`\n"
-                f"Tickers: {tickers}\n"
-                f"Range: {data.get('from_date')} to {data.get('until_date')}\n"
-                f"Tasks: {data.get('total_tasks', '?')}"
-            )
-        elif event == 'job_progress':
-            return (
-                f"*Job Progress*\n\n"
-                f"ID: `{short_id}` — {data.get('percentage', 0):.0f}%\n"
-                f"Completed: {data.get('completed', 0)}/{data.get('total', 0)}\n"
-                f"Failed: {data.get('failed', 0)}"
-            )
-        elif event == 'job_completed':
-            elapsed = ''
-            if data.get('started_at') and data.get('completed_at'):
-                try:
-                    start = datetime.fromisoformat(data['started_at'])
-                    end = datetime.fromisoformat(data['completed_at'])
-                    elapsed = f"\nDuration: {self._format_uptime((end - start).total_seconds())}"
-                except Exception:
-                    pass
-            return (
-                f"*Job Completed*\n\n"
-                f"ID: `{short_id}`\n"
-                f"Tickers: {tickers}\n"
-                f"Tasks: {data.get('completed_tasks', 0)}/{data.get('total_tasks', 0)}\n"
-                f"Records: {data.get('total_records', 0):,}\n"
-                f"Failed: {data.get('failed_tasks', 0)}"
-                f"{elapsed}"
-            )
-        elif event == 'job_failed':
-            return (
-                f"*Job Failed*\n\n"
-                f"ID: `{short_id}`\n"
-                f"Tickers: {tickers}\n"
-                f"Error: {data.get('error', 'Unknown')}"
-            )
-        elif event == 'job_paused':
-            return (
-                f"*Job Paused*\n\n"
-                f"ID: `{short_id}`\n"
-                f"Tickers: {tickers}\n"
-                f"Reason: {data.get('reason', 'Unknown')}"
-            )
-        return None
+        entry = _JOB_EVENT_TEMPLATES.get(event)
+        if entry is None:
+            return None
+        template, defaults = entry
+
+        elapsed = ''
+        if event == 'job_completed' and data.get('started_at') and data.get('completed_at'):
+            try:
+                start = datetime.fromisoformat(data['started_at'])
+                end = datetime.fromisoformat(data['completed_at'])
+                elapsed = f"\nDuration: {self._format_uptime((end - start).total_seconds())}"
+            except Exception:
+                pass
+
+        # error/reason text and tickers can hold <, & or _; escape for HTML
+        view = {
+            key: escape(value) if isinstance(value, str) else value
+            for key, value in {**defaults, **data}.items()
+        }
+        view['short_id'] = escape(data.get('job_id', '?')[:8])
+        view['tickers_joined'] = self._format_tickers(data.get('tickers', []))
+        view['elapsed'] = elapsed
+        return template.format_map(view)
 
     async def _upload_job_output(self, data: dict):
-        """After a job completes, upload its CSV to Google Drive."""
+        """After a job completes, upload its output files to Google Drive."""
         if not self.gdrive_uploader:
             return
         try:
-            from config import DATA_DIR
             tickers = data.get('tickers', [])
             from_date = data.get('from_date', '')
             until_date = data.get('until_date', '')
 
-            uploaded = []
-            for ticker in tickers:
-                filename = f"{ticker}_{from_date}_{until_date}.csv"
-                filepath = DATA_DIR / filename
-                if filepath.exists():
-                    result = self.gdrive_uploader.upload_job_output(filepath)
-                    if result.get('success') and not result.get('skipped'):
-                        uploaded.append(filename)
+            storage = self.job_manager.storage
+            paths = [storage.get_filename(ticker, from_date, until_date) for ticker in tickers]
+            uploaded = await self._upload(self._upload_job_files, paths)
 
             if uploaded:
                 text = (
-                    f"*Job Output Uploaded*\n\n"
+                    f"<b>Job Output Uploaded</b>\n\n"
                     f"Files: {len(uploaded)}\n"
                 )
                 for f in uploaded:
-                    text += f"  {f}\n"
-                await self.app.bot.send_message(
-                    chat_id=self.chat_id, text=text, parse_mode="Markdown"
+                    text += f"  {escape(str(f))}\n"
+                await self._safe_send(
+                    chat_id=self.chat_id, text=text, parse_mode="HTML"
                 )
         except Exception as e:
-            logger.error(f"Failed to upload job output: {e}")
+            logger.error("Failed to upload job output: %s", e)
+
+    def _upload_job_files(self, paths):
+        """Upload the job output files that exist; runs on a worker thread.
+
+        One executor hop for the whole batch rather than one per file. The
+        uploads stay sequential because the Drive client and its manifest
+        aren't safe to share across threads.
+        """
+        uploaded = []
+        for filepath in paths:
+            if not filepath.exists():
+                continue
+            result = self.gdrive_uploader.upload_job_output(filepath)
+            if result.get('success') and not result.get('skipped'):
+                uploaded.append(filepath.name)
+        return uploaded
 
     # ================================================================== #
     #  UTILITIES
     # ================================================================== #
 
+    @staticmethod
+    def _format_counts(counts, top=None):
+        """Per-ticker message counts, busiest first, one line each (HTML).
+
+        With top, only the top busiest tickers are listed (a partial sort)
+        followed by a "+N more" line.
+        """
+        if top is not None and len(counts) > top:
+            items = heapq.nlargest(top, counts.items(), key=itemgetter(1))
+            more = f"  +{len(counts) - top} more\n"
+        else:
+            items = sorted(counts.items(), key=itemgetter(1), reverse=True)
+            more = ''
+        return ''.join(
+            f"  <code>{escape(ticker)}</code>: {count:,}\n" for ticker, count in items
+        ) + more
+
+    @staticmethod
+    def _format_tickers(tickers):
+        """Comma-separated ticker list for HTML replies.
+
+        HTML only needs <, > and & escaped, so a ticker containing _ or *
+        can't break the layout the way it could under Markdown.
+        """
+        if not tickers:
+            return 'None'
+        return ', '.join(f"<code>{escape(t)}</code>" for t in tickers)
+
     @staticmethod
     def _format_uptime(seconds):
-        if not seconds or seconds < 60:
-            return f"{int(seconds or 0)}s"
-        if seconds < 3600:
-            return f"{int(seconds // 60)}m {int(seconds % 60)}s"
-        hours = int(seconds // 3600)
-        mins = int((seconds % 3600) // 60)
-        return f"{hours}h {mins}m"
+        # every unit shown is whole seconds, so quantize before the cache
+        # lookup and keep float uptimes from spraying unique keys into it
+        return _uptime_text(int(seconds or 0))
@@ -3,25 +3,94 @@
 Test if WebSocket uses text format instead of Protobuf
 """
 import asyncio
+import hashlib
+import json
+import time
 import websockets
 import logging
 from auth import TokenManager
-from config import STOCKBIT_WEBSOCKET_URL
+from config import CONFIG_DIR, STOCKBIT_WEBSOCKET_URL
+
+# orjson when installed; decoded back to str so format 2 still goes out as a
+# text frame (both produce the same compact JSON)
+try:
+    import orjson
+    
+    def dumps_compact(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def dumps_compact(obj):
+        return json.dumps(obj, separators=(',', ':'))
 
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+TICKERS = ["BBCA", "TLKM"]
+
+# ticker fields of the text formats depend only on TICKERS; build them once
+FORMAT1_TICKERS = (
+    ''.join(TICKERS)
+    + ''.join(f"2{t}" for t in TICKERS)  # the "2BBCA2TLKM" pattern
+    + ':'.join(TICKERS)
+    + 'J' + 'J'.join(TICKERS)
+)
+FORMAT3_TICKERS = ','.join(TICKERS)
+
+EXTRA_HEADERS = {
+    'User-Agent': 'Mozilla/5.0',
+    'Origin': 'https://stockbit.com'
+}
+
+# the trading key is the only auth step that goes over the network, so
+# repeated probe runs reuse it while the same bearer token is in use
+KEY_CACHE_FILE = CONFIG_DIR / 'probe_trading_key.json'
+KEY_CACHE_TTL = 55 * 60
+
+def cached_trading_key(token_manager, access_token):
+    """Trading key for access_token, from the on-disk cache when still fresh"""
+    # store a digest rather than a second copy of the bearer token
+    token_digest = hashlib.sha256(access_token.encode()).hexdigest()
+    now = time.time()
+    try:
+        with open(KEY_CACHE_FILE) as f:
+            cached = json.load(f)
+        if cached['token_sha256'] == token_digest and now < cached['expires_at']:
+            return cached['key']
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    trading_key = token_manager.fetch_trading_key(token=access_token)
+    if trading_key:
+        expires_at = now + KEY_CACHE_TTL
+        if token_manager.exp:
+            expires_at = min(expires_at, token_manager.exp)
+        try:
+            with open(KEY_CACHE_FILE, 'w') as f:
+                json.dump({'token_sha256': token_digest, 'key': trading_key, 'expires_at': expires_at}, f)
+        except OSError as e:
+            print(f"Could not cache trading key: {e}")
+    return trading_key
+
 async def test_text_subscription():
     token_manager = TokenManager()
     
+    # the handshakes need none of the auth values, so open one connection
+    # per format now and let them overlap the trading-key fetch below
+    connections = [asyncio.create_task(_open_connection()) for _ in range(3)]
+    
+    # user id and token come from the saved JWT; only the trading key may
+    # need an HTTP round trip, which runs off the event loop
     user_id = token_manager.get_user_id()
-    trading_key = token_manager.fetch_trading_key()
     access_token = token_manager.get_valid_token()
+    trading_key = None
+    if access_token:
+        trading_key = await asyncio.to_thread(cached_trading_key, token_manager, access_token)
     
     if not all([user_id, trading_key, access_token]):
         print("ERROR: Missing auth data")
+        await _discard(connections)
         return
     
     print(f"User ID: {user_id}")
@@ -29,61 +98,111 @@ async def test_text_subscription():
     print(f"Token: {access_token[:50]}...")
     
     # Try different text formats based on your example
-    tickers = ["BBCA", "TLKM"]
-    
     # Format 1: Space-separated fields (like your example shows)
-    concatenated = ''.join(tickers)
-    numbered = ''.join([f"2{t}" for t in tickers])  # the "2BBCA2TLKM" pattern
-    colon_sep = ':'.join(tickers)
-    j_prefixed = 'J' + 'J'.join(tickers)
-    
-    message_format1 = f"{user_id} {concatenated}{numbered}{colon_sep}{j_prefixed},{trading_key}*{access_token}"
+    message_format1 = f"{user_id} {FORMAT1_TICKERS},{trading_key}*{access_token}"
     
     # Format 2: JSON
-    import json
-    message_format2 = json.dumps({
+    message_format2 = dumps_compact({
         "userId": user_id,
-        "tickers": tickers,
+        "tickers": TICKERS,
         "key": trading_key,
         "token": access_token
     })
     
     # Format 3: Simple delimited
-    message_format3 = f"{user_id}|{','.join(tickers)}|{trading_key}|{access_token}"
+    message_format3 = f"{user_id}|{FORMAT3_TICKERS}|{trading_key}|{access_token}"
+    
+    # each format gets its own connection, so probe all three at once
+    messages = [message_format1, message_format2, message_format3]
+    reports = [[] for _ in messages]
+    tasks = [
+        asyncio.create_task(_probe(i, msg, connection, report))
+        for i, (msg, connection, report) in enumerate(zip(messages, connections, reports), 1)
+    ]
+    
+    # the first format to get a response answers the question; cancel the
+    # others instead of sitting out their timeouts
+    success = False
+    pending = set(tasks)
+    while pending and not success:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        success = any(task.result() for task in done)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
     
-    extra_headers = {
-        'User-Agent': 'Mozilla/5.0',
-        'Origin': 'https://stockbit.com'
-    }
+    # log each probe's report in format order, not completion order
+    for task, report in zip(tasks, reports):
+        if task.cancelled():
+            report.append("- Skipped (another format already got a response)")
+        logging.info("\n".join(report))
     
-    for i, msg in enumerate([message_format1, message_format2, message_format3], 1):
-        print(f"\n{'='*60}")
-        print(f"Testing Format {i}:")
-        print(f"Message (first 100 chars): {msg[:100]}...")
-        print(f"Length: {len(msg)} chars")
-        
+    return success
+
+async def _open_connection():
+    return await websockets.connect(
+        STOCKBIT_WEBSOCKET_URL,
+        extra_headers=EXTRA_HEADERS,
+        compression=None,  # frames are tiny; skip the zlib contexts
+        max_queue=4,       # only the first reply is ever read
+        ping_interval=None,  # a few-second probe needs no keepalive task
+        ping_timeout=None,
+        open_timeout=5     # a stalled handshake fails the probe, not the run
+    )
+
+async def _discard(connections):
+    """Cancel pending connection tasks and close any that already opened"""
+    for connection in connections:
+        connection.cancel()
+    for ws in await asyncio.gather(*connections, return_exceptions=True):
+        if not isinstance(ws, BaseException):
+            await ws.close()
+
+async def _probe(i, msg, connection, report):
+    """Send one candidate subscription over connection (a task opening it),
+    appending progress to report; True on a response"""
+    report += [
+        f"\n{'='*60}",
+        f"Testing Format {i}:",
+        f"Message (first 100 chars): {msg[:100]}...",
+        f"Length: {len(msg)} chars",
+    ]
+    
+    try:
+        ws = await connection
         try:
-            async with websockets.connect(STOCKBIT_WEBSOCKET_URL, extra_headers=extra_headers) as ws:
-                print("✓ Connected")
-                
-                # send as text
-                await ws.send(msg)
-                print("✓ Sent subscription")
+            report.append("✓ Connected")
+            
+            # send as text
+            await ws.send(msg)
+            report.append("✓ Sent subscription")
+            
+            # wait for response
+            try:
+                response = await asyncio.wait_for(ws.recv(), timeout=3.0)
+                if isinstance(response, bytes):
+                    # a binary reply means the server answered in Protobuf
+                    report.append(f"✓ Got binary response ({len(response)} bytes): {response[:100].hex()}")
+                else:
+                    report.append(f"✓ Got response: {response[:200]}")
+                return True  # success!
+            except asyncio.TimeoutError:
+                report.append("✗ No response (timeout)")
+        finally:
+            await ws.close()
                 
-                # wait for response
-                try:
-                    response = await asyncio.wait_for(ws.recv(), timeout=3.0)
-                    print(f"✓ Got response: {response[:200]}")
-                    return True  # success!
-                except asyncio.TimeoutError:
-                    print("✗ No response (timeout)")
-                    
-        except websockets.exceptions.ConnectionClosed as e:
-            print(f"✗ Connection closed: code={e.code}, reason={e.reason}")
-        except Exception as e:
-            print(f"✗ Error: {e}")
+    except websockets.exceptions.ConnectionClosed as e:
+        report.append(f"✗ Connection closed: code={e.code}, reason={e.reason}")
+    except Exception as e:
+        report.append(f"✗ Error: {e}")
     
     return False
 
 if __name__ == '__main__':
+    # uvloop's faster socket I/O where available (not on Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(test_text_subscription())